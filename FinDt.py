@@ -11,87 +11,1469 @@ r"""Classe base de suporte para operacoes com datas.
 """
 
 import csv
+import mmap
+import os
 import re
-import locale
+import struct
+import sys
+import threading
+import time
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import date, timedelta
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache, wraps
+from pathlib import Path
+from types import MappingProxyType
+
+__author__ = """\n""".join(['Marcelo G Facioli (mgfacioli@yahoo.com.br)'])
+__version__ = "3.0.4"
+
+# nomes dos dias da semana, indexados por date.isoweekday() (independentes do locale do sistema)
+DIAS_SEMANA = (None, 'segunda-feira', 'terça-feira', 'quarta-feira', 'quinta-feira', 'sexta-feira', 'sábado',
+               'domingo')
+
+
+def _numpy():
+    """
+    Importa o numpy sob demanda: somente as operações em lote o utilizam, e a sua importação é a parte mais cara da
+    importação do módulo.
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError("As operações em lote requerem o pacote 'numpy'.")
+    return numpy
+
+
+def _eh_datetime64(datas):
+    """
+    Verifica se 'datas' é um numpy.ndarray do tipo datetime64, sem importar o numpy (se o numpy não tiver sido
+    importado, 'datas' não pode ser um numpy.ndarray).
+    """
+    numpy = sys.modules.get('numpy')
+    return numpy is not None and isinstance(datas, numpy.ndarray) and datas.dtype.kind == 'M'
+
+# Instrumentação (desligada por padrão): numero de chamadas e tempo acumulado (inclusivo, em segundos) das cargas
+# de arquivos de feriados, das conversões string -> date, das construções de DatasFinanceiras e dos seus métodos
+# públicos. Os envoltórios que fazem as medições só são instalados (no lugar das funções e métodos marcados) enquanto
+# a instrumentação estiver ligada; desligada, as funções originais são chamadas diretamente, sem custo adicional.
+_instrumentacao_ligada = False      # ativa_instrumentacao() / desativa_instrumentacao()
+_instrumentacao_blocos = 0          # numero de blocos instrumentacao() em execução
+_instrumentacao_originais = []      # (dono, nome do atributo, valor original) enquanto os envoltórios estão instalados
+_instrumentacao_dados = {}
+_instrumentacao_lock = threading.Lock()
+_instrumentacao_estado_lock = threading.Lock()
+
+
+def _instrumentado(nome=None):
+    """
+    Decorador que marca a função decorada como ponto de instrumentação sob 'nome' (na sua ausência, o __qualname__
+    da função). A função não é alterada: o envoltório que registra o numero de chamadas e o tempo acumulado só é
+    instalado no seu lugar enquanto a instrumentação estiver ligada.
+    """
+    def decorador(funcao):
+        funcao._chave_instrumentacao = nome or funcao.__qualname__
+        return funcao
+    return decorador
+
+
+def _envoltorio_instrumentacao(funcao):
+    """
+    Retorna o envoltório que registra o numero de chamadas e o tempo acumulado de uma função marcada por
+    _instrumentado.
+    """
+    chave = funcao._chave_instrumentacao
+
+    @wraps(funcao)
+    def envoltorio(*args, **kwargs):
+        inicio = time.perf_counter()
+        try:
+            return funcao(*args, **kwargs)
+        finally:
+            duracao = time.perf_counter() - inicio
+            with _instrumentacao_lock:
+                dados = _instrumentacao_dados.setdefault(chave, [0, 0.0])
+                dados[0] += 1
+                dados[1] += duracao
+    return envoltorio
+
+
+def _atualiza_instrumentacao():
+    """
+    Instala ou remove os envoltórios de instrumentação conforme o estado atual (ligada por ativa_instrumentacao()
+    ou por ao menos um bloco instrumentacao() em execução). Deve ser chamada com _instrumentacao_estado_lock.
+    """
+    ativa = _instrumentacao_ligada or _instrumentacao_blocos > 0
+    if ativa and not _instrumentacao_originais:
+        modulo = sys.modules[__name__]
+        donos = [modulo] + [valor for valor in vars(modulo).values()
+                            if isinstance(valor, type) and valor.__module__ == __name__]
+        for dono in donos:
+            for nome, valor in list(vars(dono).items()):
+                funcao = valor.__func__ if isinstance(valor, staticmethod) else valor
+                if not callable(funcao) or not hasattr(funcao, '_chave_instrumentacao'):
+                    continue
+                envoltorio = _envoltorio_instrumentacao(funcao)
+                setattr(dono, nome, staticmethod(envoltorio) if isinstance(valor, staticmethod) else envoltorio)
+                _instrumentacao_originais.append((dono, nome, valor))
+    elif not ativa:
+        while _instrumentacao_originais:
+            dono, nome, valor = _instrumentacao_originais.pop()
+            setattr(dono, nome, valor)
+
+
+def ativa_instrumentacao():
+    """
+    Liga a instrumentação (contagem de chamadas e tempo acumulado) dos pontos críticos do módulo. Referências a
+    métodos obtidas antes de ligada (ex.: metodo = periodo.dias) não são instrumentadas.
+    """
+    global _instrumentacao_ligada
+    with _instrumentacao_estado_lock:
+        _instrumentacao_ligada = True
+        _atualiza_instrumentacao()
+
+
+def desativa_instrumentacao():
+    """
+    Desliga a instrumentação ligada por ativa_instrumentacao(); os valores acumulados são mantidos até
+    zera_instrumentacao(). Blocos instrumentacao() em execução continuam sendo medidos até o seu término.
+    """
+    global _instrumentacao_ligada
+    with _instrumentacao_estado_lock:
+        _instrumentacao_ligada = False
+        _atualiza_instrumentacao()
+
+
+def instantaneo_instrumentacao():
+    """
+    Retorna um dicionario com os valores acumulados pela instrumentação:
+    (key : value = nome do ponto medido : {'chamadas': numero de chamadas, 'tempo': tempo acumulado em segundos})
+    """
+    with _instrumentacao_lock:
+        return {chave: {'chamadas': dados[0], 'tempo': dados[1]} for chave, dados in _instrumentacao_dados.items()}
+
+
+def zera_instrumentacao():
+    """
+    Zera os valores acumulados pela instrumentação.
+    """
+    with _instrumentacao_lock:
+        _instrumentacao_dados.clear()
+
+
+@contextmanager
+def instrumentacao():
+    """
+    Gerenciador de contexto que liga a instrumentação durante o bloco e fornece um dicionario que, ao final do
+    bloco, contém o que foi acumulado durante ele (no formato de instantaneo_instrumentacao()). A instrumentação
+    permanece ligada enquanto houver algum bloco em execução (blocos simultâneos em threads diferentes não se
+    desligam mutuamente); como ela é global, chamadas feitas por outras threads durante o bloco também são
+    contabilizadas.
+
+    Exemplo
+    -------
+        >>> with FinDt.instrumentacao() as medicao:
+        ...     periodo.dias(3)
+        >>> medicao['DatasFinanceiras.dias']['chamadas']
+    """
+    global _instrumentacao_blocos
+    antes = instantaneo_instrumentacao()
+    medicao = {}
+    with _instrumentacao_estado_lock:
+        _instrumentacao_blocos += 1
+        _atualiza_instrumentacao()
+    try:
+        yield medicao
+    finally:
+        with _instrumentacao_estado_lock:
+            _instrumentacao_blocos -= 1
+            _atualiza_instrumentacao()
+        for chave, dados in instantaneo_instrumentacao().items():
+            anterior = antes.get(chave, {'chamadas': 0, 'tempo': 0.0})
+            if dados['chamadas'] > anterior['chamadas']:
+                medicao[chave] = {'chamadas': dados['chamadas'] - anterior['chamadas'],
+                                  'tempo': dados['tempo'] - anterior['tempo']}
+
+# datas no formato "xx/xx/xxxx", com qualquer separador (ou nenhum) entre dia, mês e ano
+_DATA_MASK = re.compile(r'^(\d{2})\D*(\d{2})\D*(\d{4})$')
+
+# numero máximo de cadeias de caracteres mantidas no cache de conversão string -> date
+TAMANHO_CACHE_DATAS = 65536
+
+
+@_instrumentado('conversao_data')
+def _analisa_data(texto):
+    """
+    Converte uma data no formato string ("xx/xx/xxxx", "xx-xx-xxxx", ...) em datetime.date.
+    """
+    partes = _DATA_MASK.search(texto)
+    if partes is None:
+        raise ValueError("Separador Indefinido: {!r}".format(texto))
+    dia, mes, ano = partes.groups()
+    return date(int(ano), int(mes), int(dia))
+
+
+@lru_cache(maxsize=TAMANHO_CACHE_DATAS)
+def _str_para_data(texto):
+    """
+    Versão de _analisa_data com cache LRU limitado: arquivos de operações repetem as mesmas datas muitas vezes.
+    _analisa_data é obtida do módulo a cada conversão efetiva (fora do cache), para que seja contabilizada pela
+    instrumentação quando ligada.
+    """
+    return _analisa_data(texto)
+
+
+def _para_data(data):
+    """
+    Converte uma data no formato string ou datetime.date em datetime.date, sem criar uma instância de FormataData.
+    """
+    if type(data) is date:
+        return data
+    elif type(data) is str:
+        return _str_para_data(data)
+    elif data is None:
+        return None
+    raise TypeError("O parametro deve ser uma string ou datetime.date: {!r}".format(data))
+
+
+def _data_para_str(data):
+    """
+    Converte um datetime.date em string no formato "dd/mm/aaaa".
+    """
+    return data.strftime("%d/%m/%Y")
+
+
+def parse_many(datas):
+    """
+    Converte, em bloco, uma sequência de datas no formato string ("xx/xx/xxxx", "xx-xx-xxxx", ...) ou datetime.date
+    em uma lista de datetime.date. Cadeias de caracteres repetidas são convertidas uma única vez (cache LRU).
+
+    Parametros
+    ----------
+        datas - sequência (ou iterável) de datas no formato string ou datetime.date.
+    """
+    para_data = _para_data
+    return [para_data(data) for data in datas]
+
+
+class FormataData(object):
+    """
+    FormataData é uma classe auxiliar à classe FinDt e que forncede métodos para transformar datas no formato 'string'
+    para o formato 'date' do Python e vice-versa. Quando fornecida uma data no formato 'string', transforma o separador
+    de data de diversos formatos (/, :, - ou espaço em branco) no separador padrao "/", antes de convertê-la no formato
+    date.
+
+    Parametros
+    ----------
+        Data - cadeia de caracteres (string) que representa uma data que pode ser de diversos formatos:
+             "xx/xx/xxxx"
+             "xx:xx:xxxx"
+             "xx-xx-xxxx"
+             "xx xx xxxx"
+
+    Uma data em formato inválido gera um ValueError; um parametro de tipo inválido gera um TypeError.
+    Para converter muitas datas de uma vez, prefira a função parse_many().
+    """
+
+    def __init__(self, data=None):
+        self._data = data
+
+    def normaliza_data(self):
+        """
+
+        Converte o separador de data de diversos formatos no separador padrao "/".
+
+        """
+        if self._data is not None:
+            if type(self._data) is not str:
+                raise TypeError("O parametro deve ser uma string: {!r}".format(self._data))
+            partes = _DATA_MASK.search(self._data)
+            if partes is None:
+                raise ValueError("Separador Indefinido: {!r}".format(self._data))
+            return "{}/{}/{}".format(*partes.groups())
+        else:
+            return None
+
+    def str_para_data(self):
+        """
+
+        Transforma uma Data do formato String para formato Date
+
+        """
+
+        return _para_data(self._data)
+
+    def data_para_str(self):
+        """
+        Transforma uma Data no formato Date para formato String.
+
+        """
+
+        if self._data is not None:
+            if type(self._data) is str:
+                self._data = self.normaliza_data()
+                return self._data
+            elif type(self._data) is date:
+                return _data_para_str(self._data)
+            raise TypeError("O parametro deve ser uma string ou datetime.date: {!r}".format(self._data))
+        else:
+            return None
+
+
+class CalendarioFeriados(object):
+    """
+    CalendarioFeriados é uma representação imutável dos feriados contidos em um arquivo de feriados (ex.: 'Anbima').
+    Os feriados são mantidos como uma sequência ordenada de ordinais de data (date.toordinal()), de modo que uma mesma
+    instância possa ser compartilhada por todas as instâncias de DatasFinanceiras que usem o mesmo arquivo.
+
+    Normalmente não é instanciada diretamente, mas obtida por meio da função carrega_calendario(), que mantém um
+    cache por arquivo.
+
+    O calendário também pode ser carregado de um arquivo binário compacto, gerado por compila_calendario(); neste
+    caso, o arquivo é mapeado em memória (mmap) e não há conversão de datas na carga.
+
+    Para a contagem de dias úteis, o calendário mantém um índice de dias úteis que cobre do primeiro dia do ano do
+    primeiro feriado até o último dia do ano do último feriado: uma máscara de bits (um bit por dia, ligado nos dias
+    úteis) e o numero acumulado de dias úteis a cada bloco de 64 dias. O índice é construído uma única vez, na
+    primeira consulta, e torna a contagem de dias úteis entre duas datas uma operação de custo constante (duas
+    consultas ao acumulado e duas contagens de bits); a seleção dos dias úteis de um periodo se reduz a operações
+    bit a bit. Fora deste intervalo, apenas sábados e domingos são considerados dias não úteis.
+
+    As instâncias são imutáveis (os índices construídos sob demanda são protegidos por um lock) e podem ser
+    compartilhadas livremente entre threads. Ao serem serializadas (pickle), por exemplo para um processo de um
+    ProcessPoolExecutor, os calendários carregados de um arquivo transportam apenas o caminho do arquivo e são
+    recarregados (uma única vez por processo) por carrega_calendario(); os demais transportam os seus feriados.
+
+    Parametros
+    ----------
+        ordinais - sequência de números inteiros (date.toordinal()) representando as datas dos feriados.
+
+        descricoes - sequência de cadeias de caracteres (string), alinhada com 'ordinais', contendo a descrição de
+            cada feriado.
+
+        path_arquivo - (OPCIONAL) caminho (path) do arquivo de origem dos feriados.
+    """
+
+    __slots__ = ('_ordinais', '_descricoes', '_path_arquivo', '_feriados', '_indice', '_lock', '_busdaycal',
+                 '_mmap')
+
+    def __init__(self, ordinais, descricoes, path_arquivo=None):
+        pares = sorted(zip(ordinais, descricoes), key=lambda t: t[0])
+        self._inicializa(tuple(par[0] for par in pares), tuple(par[1] for par in pares), path_arquivo)
+
+    def _inicializa(self, ordinais, descricoes, path_arquivo, arquivo_mapeado=None):
+        define = object.__setattr__
+        define(self, '_ordinais', ordinais)
+        define(self, '_descricoes', descricoes)
+        define(self, '_path_arquivo', path_arquivo)
+        define(self, '_mmap', arquivo_mapeado)
+        define(self, '_feriados', None)
+        define(self, '_indice', None)
+        define(self, '_lock', threading.Lock())
+        define(self, '_busdaycal', None)
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("CalendarioFeriados é imutável")
+
+    def __delattr__(self, nome):
+        raise AttributeError("CalendarioFeriados é imutável")
+
+    def __reduce__(self):
+        if self._path_arquivo is not None:
+            return carrega_calendario, (self._path_arquivo,)
+        return CalendarioFeriados, (list(self._ordinais), list(self._descricoes))
+
+    @classmethod
+    def de_csv(cls, path_arquivo):
+        """
+        Cria um CalendarioFeriados a partir de um arquivo csv no formato da 'Anbima' (data;dia_da_semana;descricao).
+
+        Parametros
+        ----------
+            path_arquivo - caminho (path) para o arquivo tipo csv contendo os feriados.
+        """
+        with open(path_arquivo, 'r', encoding="ISO-8859-1") as csvfile:
+            feriados = csv.reader(csvfile, dialect='excel', delimiter=';')
+            dic_selic = {_analisa_data(row[0]).toordinal(): row[2] for row in feriados}
+        return cls(dic_selic.keys(), dic_selic.values(), path_arquivo=path_arquivo)
+
+    @classmethod
+    def de_binario(cls, path_arquivo):
+        """
+        Cria um CalendarioFeriados a partir de um arquivo binário gerado por compila_calendario(). O arquivo é
+        mapeado em memória (somente leitura), de modo que processos que usem o mesmo arquivo compartilhem as mesmas
+        páginas do cache do sistema operacional; as datas e as descrições são lidas diretamente do mapeamento.
+
+        O mapeamento é mantido enquanto o calendário existir (ver compila_calendario() sobre a substituição do
+        arquivo enquanto ele estiver mapeado). Um arquivo com assinatura, versão ou tamanho inconsistentes com o
+        cabeçalho (ex.: truncado) gera ValueError.
+
+        Parametros
+        ----------
+            path_arquivo - caminho (path) para o arquivo binário de feriados.
+        """
+        with open(path_arquivo, 'rb') as arquivo:
+            arquivo_mapeado = mmap.mmap(arquivo.fileno(), 0, access=mmap.ACCESS_READ)
+
+        ini_ordinais = struct.calcsize(_FORMATO_CABECALHO_BINARIO)
+        valido = len(arquivo_mapeado) >= ini_ordinais
+        if valido:
+            assinatura, versao, num_feriados = struct.unpack_from(_FORMATO_CABECALHO_BINARIO, arquivo_mapeado, 0)
+            ini_posicoes = ini_ordinais + 4 * num_feriados
+            ini_textos = ini_posicoes + 4 * (num_feriados + 1)
+            valido = (assinatura == _ASSINATURA_BINARIO and versao == _VERSAO_BINARIO and
+                      len(arquivo_mapeado) >= ini_textos and
+                      len(arquivo_mapeado) == ini_textos + struct.unpack_from('<I', arquivo_mapeado, ini_textos - 4)[0])
+        if not valido:
+            arquivo_mapeado.close()
+            raise ValueError("Arquivo de feriados binário inválido: {}".format(path_arquivo))
+
+        memoria = memoryview(arquivo_mapeado)
+        if sys.byteorder == 'little':
+            ordinais = memoria[ini_ordinais:ini_posicoes].cast('i')
+            posicoes = memoria[ini_posicoes:ini_textos].cast('I')
+        else:
+            # em máquinas big-endian, os inteiros (little-endian no arquivo) são convertidos na carga
+            ordinais = struct.unpack_from('<{}i'.format(num_feriados), arquivo_mapeado, ini_ordinais)
+            posicoes = struct.unpack_from('<{}I'.format(num_feriados + 1), arquivo_mapeado, ini_posicoes)
+
+        calendario = cls.__new__(cls)
+        calendario._inicializa(ordinais, _DescricoesBinarias(memoria[ini_textos:], posicoes), path_arquivo,
+                               arquivo_mapeado)
+        return calendario
+
+    @property
+    def path_arquivo(self):
+        return self._path_arquivo
+
+    @property
+    def ordinais(self):
+        return self._ordinais
+
+    @property
+    def feriados(self):
+        """
+        Dicionario (somente leitura) data : feriado, ordenado por data. É construído no primeiro acesso.
+        """
+        if self._feriados is None:
+            with self._lock:
+                if self._feriados is None:
+                    object.__setattr__(self, '_feriados', MappingProxyType(OrderedDict(
+                        (date.fromordinal(ordinal), descricao)
+                        for ordinal, descricao in zip(self._ordinais, self._descricoes))))
+        return self._feriados
+
+    def __len__(self):
+        return len(self._ordinais)
+
+    def __contains__(self, data):
+        ordinal = data.toordinal()
+        pos = bisect_left(self._ordinais, ordinal)
+        return pos < len(self._ordinais) and self._ordinais[pos] == ordinal
+
+    def feriados_entre(self, ord_inicio, ord_fim):
+        """
+        Retorna uma lista de tuplas (ordinal, descricao) com os feriados entre dois ordinais de data (inclusive).
+        """
+        pos_ini = bisect_left(self._ordinais, ord_inicio)
+        pos_fim = bisect_right(self._ordinais, ord_fim)
+        return list(zip(self._ordinais[pos_ini:pos_fim], self._descricoes[pos_ini:pos_fim]))
+
+    def itera_feriados(self, ord_inicio, ord_fim):
+        """
+        Gera, em ordem, as tuplas (ordinal, descricao) dos feriados entre dois ordinais de data (inclusive), sem
+        construir uma lista.
+        """
+        for pos in range(bisect_left(self._ordinais, ord_inicio), bisect_right(self._ordinais, ord_fim)):
+            yield self._ordinais[pos], self._descricoes[pos]
+
+    def _obtem_indice(self):
+        """
+        Retorna a tupla (ordinal_inicial, ordinal_final, mascara, palavras, acumulado), onde o bit i de mascara
+        (bytes, little-endian) indica se ordinal_inicial + i é dia útil, palavras[b] contém os bits 64 * b a
+        64 * b + 63 da máscara e acumulado[b] é o numero de dias úteis com ordinal entre 1 e
+        ordinal_inicial + 64 * b - 1 (inclusive). Retorna None se o calendário não tiver feriados.
+        """
+        if self._indice is None and self._ordinais:
+            with self._lock:
+                if self._indice is None:
+                    ord_ini = date(date.fromordinal(self._ordinais[0]).year, 1, 1).toordinal()
+                    ord_fim = date(date.fromordinal(self._ordinais[-1]).year, 12, 31).toordinal()
+                    num_dias = ord_fim - ord_ini + 1
+                    num_blocos = (num_dias + 63) // 64
+
+                    feriados = bytearray(num_blocos * 8)
+                    for ordinal in self._ordinais:
+                        pos = ordinal - ord_ini
+                        feriados[pos >> 3] |= 1 << (pos & 7)
+                    mascara = (_mascara_dias_semana(ord_ini, num_dias) &
+                               ~int.from_bytes(feriados, 'little')).to_bytes(num_blocos * 8, 'little')
+
+                    palavras = array('Q', (int.from_bytes(mascara[8 * bloco:8 * bloco + 8], 'little')
+                                           for bloco in range(num_blocos)))
+                    acumulado = array('q', [_dias_semana_ate(ord_ini - 1)]) * (num_blocos + 1)
+                    for bloco in range(num_blocos):
+                        acumulado[bloco + 1] = acumulado[bloco] + _conta_bits(palavras[bloco])
+                    object.__setattr__(self, '_indice', (ord_ini, ord_fim, mascara, palavras, acumulado))
+        return self._indice
+
+    def _uteis_ate(self, ordinal):
+        """
+        Numero de dias úteis com ordinal de data entre 1 e 'ordinal' (inclusive).
+        """
+        indice = self._obtem_indice()
+        if indice is None:
+            return _dias_semana_ate(ordinal)
+        ord_ini, ord_fim, _, palavras, acumulado = indice
+        if ordinal < ord_ini:
+            return _dias_semana_ate(ordinal)
+        elif ordinal <= ord_fim:
+            pos = ordinal - ord_ini
+            return acumulado[pos >> 6] + _conta_bits(palavras[pos >> 6] & ((2 << (pos & 63)) - 1))
+        else:
+            return acumulado[-1] + _dias_semana_ate(ordinal) - _dias_semana_ate(ord_fim)
+
+    def mascara_dias_uteis(self, ord_inicio, ord_fim):
+        """
+        Retorna um inteiro cujo bit i indica se o dia de ordinal ord_inicio + i é dia útil, para os dias entre dois
+        ordinais de data (inclusive). Dentro do intervalo coberto pelo índice, os bits são copiados da máscara do
+        calendário; fora dele, apenas sábados e domingos são excluídos.
+        """
+        num_dias = ord_fim - ord_inicio + 1
+        if num_dias <= 0:
+            return 0
+        mascara = _mascara_dias_semana(ord_inicio, num_dias)
+        indice = self._obtem_indice()
+        if indice is None:
+            return mascara
+        ord_ini_indice, ord_fim_indice, mascara_indice, _, _ = indice
+        inicio = max(ord_inicio, ord_ini_indice)
+        fim = min(ord_fim, ord_fim_indice)
+        if inicio <= fim:
+            pos_ini = inicio - ord_ini_indice
+            pos_fim = fim - ord_ini_indice
+            tamanho = fim - inicio + 1
+            trecho = (int.from_bytes(mascara_indice[pos_ini >> 3:(pos_fim >> 3) + 1], 'little') >> (pos_ini & 7)) & \
+                ((1 << tamanho) - 1)
+            deslocamento = inicio - ord_inicio
+            mascara = (mascara & ~(((1 << tamanho) - 1) << deslocamento)) | (trecho << deslocamento)
+        return mascara
+
+    def _conta_uteis(self, ord_inicio, ord_fim):
+        """
+        Numero de dias úteis entre dois ordinais de data (inclusive).
+        """
+        if ord_fim < ord_inicio:
+            return 0
+        return self._uteis_ate(ord_fim) - self._uteis_ate(ord_inicio - 1)
+
+    def eh_dia_util(self, data):
+        """
+        Verifica se uma data é dia útil (não é sábado, domingo ou feriado).
+
+        Parametros
+        ----------
+            data - a data a ser verificada (formato string "xx/xx/xxxx" ou datetime.date).
+        """
+        data = _para_data(data)
+        return data.isoweekday() < 6 and data not in self
+
+    def conta_dias_uteis(self, data_inicio, data_fim):
+        """
+        Retorna o numero de dias úteis (sem sábados, domingos e feriados) entre uma data inicial e uma data final,
+        ambas inclusive. Equivale a len(DatasFinanceiras(data_inicio, data_fim, path_arquivo=...).dias(opt=3)),
+        porém com custo constante.
+
+        Assim como em DatasFinanceiras (e em conta_dias_uteis_lote), uma data final anterior a data inicial gera
+        um periodo de abs((data_fim - data_inicio).days + 1) dias a partir da data inicial.
+
+        Parametros
+        ----------
+            data_inicio - a data inicial (formato string "xx/xx/xxxx" ou datetime.date).
+
+            data_fim - a data final (formato string "xx/xx/xxxx" ou datetime.date).
+        """
+        ord_inicio = _para_data(data_inicio).toordinal()
+        ord_fim = _para_data(data_fim).toordinal()
+        if ord_fim < ord_inicio:
+            ord_fim = ord_inicio + (ord_inicio - ord_fim) - 2
+        return self._conta_uteis(ord_inicio, ord_fim)
+
+    def _kesimo_dia_util(self, k):
+        """
+        Retorna o ordinal do k-ésimo dia útil, contado a partir de 01/01/0001, ou seja, o menor ordinal x tal que
+        _uteis_ate(x) >= k.
+
+        Parte do k-ésimo dia de segunda a sexta-feira (limite inferior para a resposta) e avança pelo numero de
+        feriados encontrados até ele, até que não haja mais feriados a compensar. O numero de iterações é limitado
+        pelo numero de feriados entre a estimativa inicial e a resposta (tipicamente um ou dois).
+        """
+        ordinal = _kesimo_dia_semana(k)
+        while True:
+            uteis = self._uteis_ate(ordinal)
+            if uteis >= k:
+                return ordinal
+            ordinal = _kesimo_dia_semana(k + _dias_semana_ate(ordinal) - uteis)
+
+    def add_dias_uteis(self, data, num_dias, dt_type='date'):
+        """
+        Retorna a data situada 'num_dias' dias úteis após (num_dias > 0) ou antes (num_dias < 0) de uma data, sem
+        construir nenhuma lista de dias. Com num_dias = 0, retorna a própria data, se for dia útil, ou o dia útil
+        seguinte.
+
+        Parametros
+        ----------
+            data - a data de referência (formato string "xx/xx/xxxx" ou datetime.date); não precisa ser dia útil.
+
+            num_dias - numero inteiro de dias úteis do deslocamento.
+
+            dt_type - (OPICIONAL) Permite determinar o tipo de dados que será retornado:
+                Opção date: retorna datas no formato datetime.date(aaaa, mm, dd) do python
+                Opção str:  retorna datas no formato string "dd/mm/aaaa"
+        """
+        ordinal = _para_data(data).toordinal()
+        if num_dias > 0:
+            resultado = self._kesimo_dia_util(self._uteis_ate(ordinal) + num_dias)
+        else:
+            resultado = self._kesimo_dia_util(self._uteis_ate(ordinal - 1) + num_dias + 1)
+        return _converte_data(date.fromordinal(resultado), dt_type)
+
+    def proximo_dia_util(self, data, dt_type='date'):
+        """
+        Retorna o primeiro dia útil posterior a uma data (formato string "xx/xx/xxxx" ou datetime.date).
+        """
+        return self.add_dias_uteis(data, 1, dt_type)
+
+    def dia_util_anterior(self, data, dt_type='date'):
+        """
+        Retorna o último dia útil anterior a uma data (formato string "xx/xx/xxxx" ou datetime.date).
+        """
+        return self.add_dias_uteis(data, -1, dt_type)
+
+    def ajusta_dia_util(self, data, convencao='following', dt_type='date'):
+        """
+        Ajusta uma data para um dia útil, segundo uma convenção de mercado. Se a data já for dia útil, ela é
+        retornada sem alteração.
+
+        Parametros
+        ----------
+            data - a data a ser ajustada (formato string "xx/xx/xxxx" ou datetime.date).
+
+            convencao - (OPICIONAL) Permite selecionar entre 3 convenções de ajuste:
+                'following': o dia útil seguinte.
+                'preceding': o dia útil anterior.
+                'modified_following': o dia útil seguinte, a menos que ele caia no mês seguinte; neste caso, o dia
+                    útil anterior.
+
+            dt_type - (OPICIONAL) Permite determinar o tipo de dados que será retornado:
+                Opção date: retorna datas no formato datetime.date(aaaa, mm, dd) do python
+                Opção str:  retorna datas no formato string "dd/mm/aaaa"
+        """
+        data = _para_data(data)
+        ordinal = data.toordinal()
+        if convencao == 'following':
+            resultado = date.fromordinal(self._kesimo_dia_util(self._uteis_ate(ordinal - 1) + 1))
+        elif convencao == 'preceding':
+            resultado = date.fromordinal(self._kesimo_dia_util(self._uteis_ate(ordinal)))
+        elif convencao == 'modified_following':
+            resultado = date.fromordinal(self._kesimo_dia_util(self._uteis_ate(ordinal - 1) + 1))
+            if resultado.month != data.month:
+                resultado = date.fromordinal(self._kesimo_dia_util(self._uteis_ate(ordinal)))
+        else:
+            raise ValueError("Convenção de ajuste desconhecida: {}".format(convencao))
+        return _converte_data(resultado, dt_type)
+
+    def primeiro_dia_util_mes(self, data, dt_type='date'):
+        """
+        Retorna o primeiro dia útil do mês de uma data (formato string "xx/xx/xxxx" ou datetime.date). Se o mês não
+        tiver nenhum dia útil, retorna o primeiro dia útil seguinte.
+        """
+        return self.ajusta_dia_util(_para_data(data).replace(day=1), 'following', dt_type)
+
+    def ultimo_dia_util_mes(self, data, dt_type='date'):
+        """
+        Retorna o último dia útil do mês de uma data (formato string "xx/xx/xxxx" ou datetime.date). Se o mês não
+        tiver nenhum dia útil, retorna o último dia útil anterior.
+        """
+        return self.ajusta_dia_util(date.fromordinal(_fim_mes(_para_data(data))), 'preceding', dt_type)
+
+    def _obtem_busdaycal(self):
+        """
+        Retorna o numpy.busdaycalendar (segunda a sexta-feira, menos os feriados) correspondente ao calendário.
+        """
+        if self._busdaycal is None:
+            np = _numpy()
+            with self._lock:
+                if self._busdaycal is None:
+                    feriados = (np.array(self._ordinais, dtype='int64') -
+                                _ORDINAL_EPOCH_NUMPY).astype('datetime64[D]')
+                    object.__setattr__(self, '_busdaycal',
+                                       np.busdaycalendar(weekmask='1111100', holidays=feriados))
+        return self._busdaycal
+
+    def conta_dias_uteis_lote(self, datas_inicio, datas_fim):
+        """
+        Versão vetorizada (numpy) de conta_dias_uteis: retorna um numpy.ndarray com o numero de dias úteis entre
+        cada par (data_inicio, data_fim), com o mesmo resultado de len(DatasFinanceiras(data_inicio, data_fim,
+        path_arquivo=...).dias(opt=3)) para cada par.
+
+        Parametros
+        ----------
+            datas_inicio - numpy.ndarray do tipo datetime64 ou sequência de datas (formato string "xx/xx/xxxx" ou
+                datetime.date).
+
+            datas_fim - numpy.ndarray do tipo datetime64 ou sequência de datas (formato string "xx/xx/xxxx" ou
+                datetime.date), com o mesmo tamanho de datas_inicio.
+        """
+        np = _numpy()
+        inicios = _para_datetime64(datas_inicio)
+        fins = _para_datetime64(datas_fim)
+        # Assim como em DatasFinanceiras, uma data final anterior a data inicial gera um periodo de
+        # abs((data_fim - data_inicio).days + 1) dias a partir da data inicial.
+        fins = np.where(fins < inicios, inicios + (inicios - fins) - np.timedelta64(2, 'D'), fins)
+        return np.busday_count(inicios, fins + np.timedelta64(1, 'D'), busdaycal=self._obtem_busdaycal())
+
+    def desloca_dias_uteis_lote(self, datas, num_dias):
+        """
+        Versão vetorizada (numpy) do deslocamento de datas em dias úteis: retorna um numpy.ndarray (datetime64[D])
+        com a data situada 'num_dias' dias úteis após (num_dias > 0) ou antes (num_dias < 0) de cada data. Com
+        num_dias = 0, retorna a própria data, se for dia útil, ou o dia útil seguinte.
+
+        Parametros
+        ----------
+            datas - numpy.ndarray do tipo datetime64 ou sequência de datas (formato string "xx/xx/xxxx" ou
+                datetime.date).
+
+            num_dias - numero inteiro ou numpy.ndarray de inteiros (um para cada data) de dias úteis do deslocamento.
+        """
+        np = _numpy()
+        datas = _para_datetime64(datas)
+        num_dias = np.asarray(num_dias, dtype='int64')
+        busdaycal = self._obtem_busdaycal()
+        # Para deslocamentos positivos, uma data não útil é ajustada para o dia útil anterior antes do deslocamento
+        # (e para o seguinte, nos demais casos), de modo que o resultado seja sempre o n-ésimo dia útil após a data.
+        para_frente = np.busday_offset(datas, num_dias, roll='preceding', busdaycal=busdaycal)
+        para_tras = np.busday_offset(datas, num_dias, roll='following', busdaycal=busdaycal)
+        return np.where(num_dias > 0, para_frente, para_tras)
+
+
+class _DescricoesBinarias(object):
+    """
+    Sequência (somente leitura) das descrições dos feriados de um arquivo binário: as descrições são decodificadas
+    a partir do mapeamento em memória apenas quando acessadas.
+    """
+
+    __slots__ = ('_textos', '_posicoes')
+
+    def __init__(self, textos, posicoes):
+        self._textos = textos
+        self._posicoes = posicoes
+
+    def __len__(self):
+        return len(self._posicoes) - 1
+
+    def __getitem__(self, pos):
+        if isinstance(pos, slice):
+            return [self[i] for i in range(*pos.indices(len(self)))]
+        if pos < 0:
+            pos += len(self)
+        if not 0 <= pos < len(self):
+            raise IndexError("indice fora do intervalo")
+        return str(self._textos[self._posicoes[pos]:self._posicoes[pos + 1]], 'utf-8')
+
+
+_ASSINATURA_BINARIO = b'FINDTCAL'
+_VERSAO_BINARIO = 1
+# assinatura, versão e numero de feriados; seguidos de int32 ordinais[n], uint32 posicoes[n + 1] e das descrições
+# (utf-8) concatenadas; todos os inteiros em little-endian
+_FORMATO_CABECALHO_BINARIO = '<8sII'
+
+
+def compila_calendario(path_arquivo, path_binario):
+    """
+    Converte um arquivo de feriados csv (formato da 'Anbima') em um arquivo binário compacto, que pode ser usado no
+    lugar do arquivo csv como 'path_arquivo' de DatasFinanceiras ou de carrega_calendario(). O arquivo binário é
+    mapeado em memória na carga, sem nenhuma conversão de datas, e pode ser compartilhado por vários processos.
+
+    Parametros
+    ----------
+        path_arquivo - caminho (path) para o arquivo csv de feriados.
+
+        path_binario - caminho (path) do arquivo binário a ser gerado.
+
+    Observação: um arquivo binário permanece mapeado em memória enquanto existir algum calendário carregado dele.
+    O calendário correspondente a 'path_binario' é retirado do cache de carrega_calendario() antes da substituição
+    do arquivo, mas, se ainda houver referências a ele (ex.: DatasFinanceiras criadas com calendario=..., registro
+    de calendários ou outros processos), no Windows a substituição de um arquivo mapeado falha com PermissionError.
+    Nesse caso, gere o arquivo com outro nome; nos demais sistemas, os calendários existentes continuam a ler o
+    arquivo anterior e as novas cargas leem o novo.
+    """
+    calendario = CalendarioFeriados.de_csv(path_arquivo)
+    textos = [descricao.encode('utf-8') for descricao in calendario._descricoes]
+    posicoes = [0]
+    for texto in textos:
+        posicoes.append(posicoes[-1] + len(texto))
+
+    conteudo = b''.join([struct.pack(_FORMATO_CABECALHO_BINARIO, _ASSINATURA_BINARIO, _VERSAO_BINARIO, len(textos)),
+                         struct.pack('<{}i'.format(len(textos)), *calendario.ordinais),
+                         struct.pack('<{}I'.format(len(posicoes)), *posicoes)] + textos)
+
+    # grava em um arquivo temporário e o renomeia, para que nenhum processo mapeie um arquivo incompleto
+    path_temporario = "{}.{}.tmp".format(path_binario, os.getpid())
+    with open(path_temporario, 'wb') as arquivo:
+        arquivo.write(conteudo)
+    with _cache_lock:
+        _cache_calendarios.pop(os.path.abspath(path_binario), None)
+    os.replace(path_temporario, path_binario)
+
+
+@_instrumentado('carga_arquivo_feriados')
+def _le_calendario(path_arquivo):
+    """
+    Lê um arquivo de feriados, binário (compila_calendario) ou csv, identificado pela assinatura do arquivo binário.
+    """
+    with open(path_arquivo, 'rb') as arquivo:
+        binario = arquivo.read(len(_ASSINATURA_BINARIO)) == _ASSINATURA_BINARIO
+    if binario:
+        return CalendarioFeriados.de_binario(path_arquivo)
+    return CalendarioFeriados.de_csv(path_arquivo)
+
+
+def _dias_semana_ate(ordinal):
+    """
+    Numero de dias de segunda a sexta-feira com ordinal de data entre 1 e 'ordinal' (inclusive). O ordinal 1
+    (01/01/0001) é uma segunda-feira.
+    """
+    return (ordinal // 7) * 5 + min(ordinal % 7, 5)
+
+
+# numero de bits ligados de um inteiro não negativo
+_conta_bits = getattr(int, 'bit_count', None) or (lambda mascara: bin(mascara).count('1'))
+
+# posições dos bits ligados de cada valor de byte (0 a 255)
+_BITS_POR_BYTE = tuple(tuple(bit for bit in range(8) if byte >> bit & 1) for byte in range(256))
+
+
+def _mascara_dias_semana(ord_inicio, num_dias):
+    """
+    Retorna um inteiro de 'num_dias' bits cujo bit i indica se o dia de ordinal ord_inicio + i cai de segunda a
+    sexta-feira. O padrão de 7 bits da primeira semana é replicado por multiplicação pelo inteiro 1000000100...1
+    (base 2), de modo que nenhum dia é visitado individualmente.
+    """
+    if num_dias <= 0:
+        return 0
+    padrao = 0
+    for dia in range(7):
+        if (ord_inicio + dia) % 7 not in (6, 0):
+            padrao |= 1 << dia
+    semanas = num_dias // 7 + 1
+    return (padrao * (((1 << (7 * semanas)) - 1) // 127)) & ((1 << num_dias) - 1)
+
+
+def _ordinais_da_mascara(mascara, ord_inicio, num_dias):
+    """
+    Retorna a lista dos ordinais ord_inicio + i correspondentes aos bits i ligados de uma máscara de 'num_dias'
+    bits, percorrendo a máscara byte a byte.
+    """
+    ordinais = []
+    adiciona = ordinais.append
+    base = ord_inicio
+    for byte in mascara.to_bytes((num_dias + 7) // 8, 'little'):
+        if byte:
+            for bit in _BITS_POR_BYTE[byte]:
+                adiciona(base + bit)
+        base += 8
+    return ordinais
+
+
+# numero de dias (múltiplo de 7 e de 8) processados de cada vez pelos geradores de dias
+_BLOCO_ITERACAO = 448
+
+
+def _itera_ordinais(ord_inicio, ord_limite, opt, calendario=None, sentido=1):
+    """
+    Gera os ordinais de data a partir de ord_inicio, no sentido indicado (1: para frente, -1: para trás), até
+    ord_limite (inclusive), segundo a opção de dias de DatasFinanceiras.dias (1: corridos, 2: sem sábados e
+    domingos, 3: sem sábados, domingos e feriados de 'calendario'). Os dias são selecionados em blocos de
+    _BLOCO_ITERACAO dias, de modo que interromper a iteração não exige processar o restante do intervalo. Uma opção
+    diferente de 1, 2 ou 3 gera ValueError.
+    """
+    if opt not in (1, 2, 3):
+        raise ValueError("Opção de dias inválida: {!r} (use 1, 2 ou 3)".format(opt))
+    if opt == 1:
+        for ordinal in range(ord_inicio, ord_limite + sentido, sentido):
+            yield ordinal
+        return
+    atual = ord_inicio
+    while (atual - ord_limite) * sentido <= 0:
+        if sentido > 0:
+            inicio, fim = atual, min(atual + _BLOCO_ITERACAO - 1, ord_limite)
+        else:
+            inicio, fim = max(atual - _BLOCO_ITERACAO + 1, ord_limite), atual
+        if opt == 2:
+            mascara = _mascara_dias_semana(inicio, fim - inicio + 1)
+        else:
+            mascara = calendario.mascara_dias_uteis(inicio, fim)
+        ordinais = _ordinais_da_mascara(mascara, inicio, fim - inicio + 1)
+        for ordinal in (ordinais if sentido > 0 else reversed(ordinais)):
+            yield ordinal
+        atual = fim + 1 if sentido > 0 else inicio - 1
+
+
+def _kesimo_dia_semana(k):
+    """
+    Ordinal do k-ésimo dia de segunda a sexta-feira, contado a partir de 01/01/0001 (inversa de _dias_semana_ate).
+    """
+    return ((k - 1) // 5) * 7 + (k - 1) % 5 + 1
+
+
+def _converte_data(data, dt_type):
+    """
+    Retorna uma data (datetime.date) no tipo de dados indicado por dt_type ('date' ou 'str').
+    """
+    if dt_type == 'date':
+        return data
+    elif dt_type == 'str':
+        return _data_para_str(data)
+
+
+def _limites_semana(data):
+    """
+    Retorna a tupla (ordinal inicial, ordinal final, 'ss/aaaa') da semana ISO 8601 que contém uma data.
+    """
+    ano, semana, dia_semana = data.isocalendar()
+    ord_ini = data.toordinal() - dia_semana + 1
+    return ord_ini, ord_ini + 6, "{:02d}/{}".format(semana, ano)
+
+
+def _fim_mes(data):
+    """
+    Retorna o ordinal do último dia do mês que contém uma data: o dia anterior ao primeiro dia do mês seguinte.
+    """
+    if data.month == 12:
+        return date(data.year, 12, 31).toordinal()
+    return date(data.year, data.month + 1, 1).toordinal() - 1
+
+
+def _limites_mes(data):
+    """
+    Retorna a tupla (ordinal inicial, ordinal final, 'mm/aaaa') do mês que contém uma data.
+    """
+    return data.toordinal() - data.day + 1, _fim_mes(data), "{:02d}/{}".format(data.month, data.year)
+
+
+def _limites_trimestre(data):
+    """
+    Retorna a tupla (ordinal inicial, ordinal final, 'tT/aaaa') do trimestre que contém uma data.
+    """
+    trimestre = (data.month - 1) // 3 + 1
+    ord_ini = date(data.year, 3 * trimestre - 2, 1).toordinal()
+    if trimestre == 4:
+        ord_fim = date(data.year, 12, 31).toordinal()
+    else:
+        ord_fim = date(data.year, 3 * trimestre + 1, 1).toordinal() - 1
+    return ord_ini, ord_fim, "{}T/{}".format(trimestre, data.year)
+
+
+def _limites_ano(data):
+    """
+    Retorna a tupla (ordinal inicial, ordinal final, 'aaaa') do ano que contém uma data.
+    """
+    return date(data.year, 1, 1).toordinal(), date(data.year, 12, 31).toordinal(), "{}".format(data.year)
+
+
+# date(1970, 1, 1).toordinal(): diferença entre os ordinais de datetime.date e numpy.datetime64[D]
+_ORDINAL_EPOCH_NUMPY = 719163
+
+
+def _para_datetime64(datas):
+    """
+    Converte um numpy.ndarray do tipo datetime64 ou uma sequência de datas (string "xx/xx/xxxx" ou datetime.date)
+    em um numpy.ndarray do tipo datetime64[D].
+    """
+    if _eh_datetime64(datas):
+        return datas.astype('datetime64[D]')
+    return _numpy().array(parse_many(datas), dtype='datetime64[D]')
+
+
+_cache_calendarios = {}
+_cache_estatisticas = {'hits': 0, 'misses': 0}
+_cache_lock = threading.Lock()
+
+
+def carrega_calendario(path_arquivo):
+    """
+    Retorna o CalendarioFeriados correspondente a um arquivo de feriados.
+
+    O arquivo é lido uma única vez por processo e o calendário resultante é compartilhado entre todas as chamadas
+    que usem o mesmo arquivo (identificado pelo seu caminho absoluto). O arquivo só é lido novamente quando a sua
+    data de modificação (mtime) ou o seu tamanho forem alterados, ou quando o caminho passar a apontar para outro
+    arquivo (ex.: link simbólico redirecionado ou arquivo substituído).
+
+    Parametros
+    ----------
+        path_arquivo - cadeia de caracteres (string) ou Path representando o caminho (path) para o arquivo de
+            feriados, no formato csv ou no formato binário gerado por compila_calendario().
+    """
+    # os.path.abspath e os.stat (que segue links simbólicos) custam poucos microssegundos, ao contrário de
+    # Path.resolve(), que verifica cada componente do caminho; esta função é chamada a cada consulta de
+    # DatasFinanceiras.calendario
+    caminho = os.path.abspath(path_arquivo)
+    info = os.stat(caminho)
+    assinatura = (info.st_dev, info.st_ino, info.st_mtime_ns, info.st_size)
+
+    with _cache_lock:
+        entrada = _cache_calendarios.get(caminho)
+        if entrada is not None and entrada[0] == assinatura:
+            _cache_estatisticas['hits'] += 1
+            return entrada[1]
+        _cache_estatisticas['misses'] += 1
+
+    calendario = _le_calendario(caminho)
+
+    with _cache_lock:
+        _cache_calendarios[caminho] = (assinatura, calendario)
+    return calendario
+
 
-locale.setlocale(locale.LC_ALL, '')
-from datetime import date, timedelta
-from collections import OrderedDict
-from pathlib import Path
+def conta_dias_uteis_lote(datas_inicio, datas_fim, path_arquivo):
+    """
+    Retorna um numpy.ndarray com o numero de dias úteis (sem sábados, domingos e feriados) entre cada par
+    (data_inicio, data_fim), usando os feriados do arquivo 'path_arquivo'. Ver CalendarioFeriados.conta_dias_uteis_lote.
 
-__author__ = """\n""".join(['Marcelo G Facioli (mgfacioli@yahoo.com.br)'])
-__version__ = "3.0.4"
+    Parametros
+    ----------
+        datas_inicio - numpy.ndarray do tipo datetime64 ou sequência de datas (formato string "xx/xx/xxxx" ou
+            datetime.date).
 
+        datas_fim - numpy.ndarray do tipo datetime64 ou sequência de datas, com o mesmo tamanho de datas_inicio.
 
-class FormataData(object):
+        path_arquivo - caminho (path) para o arquivo de feriados.
     """
-    FormataData é uma classe auxiliar à classe FinDt e que forncede métodos para transformar datas no formato 'string'
-    para o formato 'date' do Python e vice-versa. Quando fornecida uma data no formato 'string', transforma o separador
-    de data de diversos formatos (/, :, - ou espaço em branco) no separador padrao "/", antes de convertê-la no formato
-    date.
+    return carrega_calendario(path_arquivo).conta_dias_uteis_lote(datas_inicio, datas_fim)
+
+
+def desloca_dias_uteis_lote(datas, num_dias, path_arquivo):
+    """
+    Retorna um numpy.ndarray (datetime64[D]) com cada data deslocada de 'num_dias' dias úteis, usando os feriados do
+    arquivo 'path_arquivo'. Ver CalendarioFeriados.desloca_dias_uteis_lote.
 
     Parametros
     ----------
-        Data - cadeia de caracteres (string) que representa uma data que pode ser de diversos formatos:
-             "xx/xx/xxxx"
-             "xx:xx:xxxx"
-             "xx-xx-xxxx"
-             "xx xx xxxx"
+        datas - numpy.ndarray do tipo datetime64 ou sequência de datas (formato string "xx/xx/xxxx" ou
+            datetime.date).
+
+        num_dias - numero inteiro ou numpy.ndarray de inteiros (um para cada data) de dias úteis do deslocamento.
+
+        path_arquivo - caminho (path) para o arquivo de feriados.
     """
+    return carrega_calendario(path_arquivo).desloca_dias_uteis_lote(datas, num_dias)
 
-    def __init__(self, data=None):
-        self._data = data
 
-    def normaliza_data(self):
+def add_dias_uteis(data, num_dias, path_arquivo, dt_type='date'):
+    """
+    Retorna a data situada 'num_dias' dias úteis após (num_dias > 0) ou antes (num_dias < 0) de uma data, usando os
+    feriados do arquivo 'path_arquivo'. Ver CalendarioFeriados.add_dias_uteis.
+
+    Parametros
+    ----------
+        data - a data de referência (formato string "xx/xx/xxxx" ou datetime.date).
+
+        num_dias - numero inteiro de dias úteis do deslocamento.
+
+        path_arquivo - caminho (path) para o arquivo de feriados.
+
+        dt_type - (OPICIONAL) 'date' ou 'str'.
+    """
+    return carrega_calendario(path_arquivo).add_dias_uteis(data, num_dias, dt_type)
+
+
+def proximo_dia_util(data, path_arquivo, dt_type='date'):
+    """
+    Retorna o primeiro dia útil posterior a uma data, usando os feriados do arquivo 'path_arquivo'.
+    """
+    return carrega_calendario(path_arquivo).proximo_dia_util(data, dt_type)
+
+
+def dia_util_anterior(data, path_arquivo, dt_type='date'):
+    """
+    Retorna o último dia útil anterior a uma data, usando os feriados do arquivo 'path_arquivo'.
+    """
+    return carrega_calendario(path_arquivo).dia_util_anterior(data, dt_type)
+
+
+def ajusta_dia_util(data, path_arquivo, convencao='following', dt_type='date'):
+    """
+    Ajusta uma data para um dia útil ('following', 'preceding' ou 'modified_following'), usando os feriados do
+    arquivo 'path_arquivo'. Ver CalendarioFeriados.ajusta_dia_util.
+    """
+    return carrega_calendario(path_arquivo).ajusta_dia_util(data, convencao, dt_type)
+
+
+def itera_dias(data_inicio, opt=1, dt_type='date', sentido=1, path_arquivo='', calendario=None):
+    """
+    Gera, sob demanda, os dias a partir de uma data inicial (inclusive), sem data final: para frente (sentido=1) ou
+    para trás (sentido=-1), até o limite de datetime.date. Nenhuma lista é construída; para obter somente os N
+    primeiros dias, use itertools.islice.
+
+    Parametros
+    ----------
+        data_inicio - a data inicial (formato string "xx/xx/xxxx" ou datetime.date).
+
+        opt - (OPICIONAL) 1: dias corridos; 2: sem sábados e domingos; 3: sem sábados, domingos e feriados.
+
+        dt_type - (OPICIONAL) 'date' ou 'str'.
+
+        sentido - (OPICIONAL) 1 (padrão) para datas crescentes ou -1 para datas decrescentes.
+
+        path_arquivo - (OPCIONAL/OBRIGATORIO) caminho (path) para o arquivo de feriados (obrigatório para a opção 3,
+            na ausência de 'calendario').
+
+        calendario - (OPCIONAL) instância de CalendarioFeriados, usada no lugar de path_arquivo.
+
+    Exemplo
+    -------
+        >>> from itertools import islice
+        >>> list(islice(FinDt.itera_dias('28/12/2012', 3, path_arquivo=var_path), 5))   # os 5 próximos dias úteis
+    """
+    if opt == 3 and calendario is None:
+        calendario = carrega_calendario(path_arquivo)
+    ord_limite = date.max.toordinal() if sentido > 0 else date.min.toordinal()
+    for ordinal in _itera_ordinais(_para_data(data_inicio).toordinal(), ord_limite, opt, calendario, sentido):
+        yield _converte_data(date.fromordinal(ordinal), dt_type)
+
+
+def itera_dia_especifico_semana(data_inicio, dia_da_semana=1, dt_type='date', sentido=1):
+    """
+    Gera, sob demanda e sem data final, as datas que caem em um determinado dia da semana (1 = segunda-feira, ...,
+    7 = domingo) a partir de uma data inicial (inclusive), para frente (sentido=1) ou para trás (sentido=-1). Assim
+    como em DatasFinanceiras.lista_dia_especifico_semana(), um dia da semana fora de 1 a 7 não gera nenhuma data.
+    """
+    if dia_da_semana not in range(1, 8):
+        return
+    ordinal = _para_data(data_inicio).toordinal()
+    if sentido > 0:
+        primeiro = ordinal + (dia_da_semana - (ordinal - 1) % 7 - 1) % 7
+        ordinais = range(primeiro, date.max.toordinal() + 1, 7)
+    else:
+        primeiro = ordinal - ((ordinal - 1) % 7 + 1 - dia_da_semana) % 7
+        ordinais = range(primeiro, date.min.toordinal() - 1, -7)
+    for ordinal in ordinais:
+        yield _converte_data(date.fromordinal(ordinal), dt_type)
+
+
+def limites_periodo_lote(datas, periodo='mes', extremo='fim', path_arquivo=None, calendario=None):
+    """
+    Versão em lote dos métodos primeiro/ultimo_dia_mes, _trimestre e _ano: retorna, para cada data, o primeiro
+    (extremo='inicio') ou o último (extremo='fim') dia do mês, trimestre ou ano que a contém. Se um arquivo de
+    feriados ou um calendario for informado, retorna o primeiro/último dia útil do periodo.
+
+    Para um numpy.ndarray do tipo datetime64, o cálculo é vetorizado e o resultado é um numpy.ndarray
+    (datetime64[D]); para as demais sequências de datas (string "xx/xx/xxxx" ou datetime.date), o resultado é uma
+    lista no tipo de dados datetime.date.
+
+    Parametros
+    ----------
+        datas - numpy.ndarray do tipo datetime64 ou sequência de datas.
+
+        periodo - (OPICIONAL) 'mes', 'trimestre' ou 'ano'.
+
+        extremo - (OPICIONAL) 'inicio' ou 'fim'.
+
+        path_arquivo - (OPCIONAL) caminho (path) para o arquivo de feriados, para ajuste a dias úteis.
+
+        calendario - (OPCIONAL) instância de CalendarioFeriados, usada no lugar de path_arquivo.
+
+    Exemplo
+    -------
+        >>> FinDt.limites_periodo_lote(['15/01/2013', '10/05/2013'], 'trimestre', 'fim')
+        [datetime.date(2013, 3, 31), datetime.date(2013, 6, 30)]
+    """
+    if periodo not in ('mes', 'trimestre', 'ano'):
+        raise ValueError("Periodo desconhecido: {}".format(periodo))
+    if extremo not in ('inicio', 'fim'):
+        raise ValueError("Extremo desconhecido: {}".format(extremo))
+    if calendario is None and path_arquivo is not None:
+        calendario = carrega_calendario(path_arquivo)
+    convencao = 'following' if extremo == 'inicio' else 'preceding'
+
+    if _eh_datetime64(datas):
+        np = _numpy()
+        if periodo == 'ano':
+            inicios = datas.astype('datetime64[Y]')
+            passo = np.timedelta64(1, 'Y')
+        else:
+            inicios = datas.astype('datetime64[M]')
+            passo = np.timedelta64(1, 'M')
+            if periodo == 'trimestre':
+                inicios = inicios - inicios.astype('int64') % 3
+                passo = np.timedelta64(3, 'M')
+        if extremo == 'inicio':
+            resultado = inicios.astype('datetime64[D]')
+        else:
+            resultado = (inicios + passo).astype('datetime64[D]') - np.timedelta64(1, 'D')
+        if calendario is not None:
+            resultado = np.busday_offset(resultado, 0, roll=convencao, busdaycal=calendario._obtem_busdaycal())
+        return resultado
+
+    limites = {'mes': _limites_mes, 'trimestre': _limites_trimestre, 'ano': _limites_ano}[periodo]
+    posicao = 0 if extremo == 'inicio' else 1
+    resultado = [date.fromordinal(limites(data)[posicao]) for data in parse_many(datas)]
+    if calendario is not None:
+        resultado = [calendario.ajusta_dia_util(data, convencao) for data in resultado]
+    return resultado
+
+
+def estatisticas_cache():
+    """
+    Retorna um dicionario com o numero de acertos ('hits'), falhas ('misses') e de arquivos ('arquivos') mantidos
+    no cache de calendários.
+    """
+    with _cache_lock:
+        return {'hits': _cache_estatisticas['hits'],
+                'misses': _cache_estatisticas['misses'],
+                'arquivos': len(_cache_calendarios)}
+
+
+def limpa_cache_calendarios():
+    """
+    Esvazia o cache de calendários e zera os seus contadores.
+    """
+    with _cache_lock:
+        _cache_calendarios.clear()
+        _cache_estatisticas['hits'] = 0
+        _cache_estatisticas['misses'] = 0
+
+
+def combina_calendarios(calendarios, modo='uniao'):
+    """
+    Cria um CalendarioFeriados a partir da combinação dos feriados de vários calendários. O calendário resultante é
+    um CalendarioFeriados como outro qualquer (ordinais ordenados e índice de dias úteis próprios), de modo que as
+    consultas sobre ele têm o mesmo custo das consultas sobre um único calendário.
+
+    Parametros
+    ----------
+        calendarios - sequência de instâncias de CalendarioFeriados.
+
+        modo - (OPICIONAL) Permite selecionar entre 2 modos de combinação:
+            'uniao': feriado em qualquer um dos calendários; dia útil é o dia útil em todos os mercados.
+            'intersecao': feriado em todos os calendários; dia útil é o dia útil em pelo menos um dos mercados.
+    """
+    descricoes = OrderedDict()
+    for calendario in calendarios:
+        for ordinal, descricao in zip(calendario.ordinais, calendario._descricoes):
+            descricoes.setdefault(ordinal, [])
+            if descricao not in descricoes[ordinal]:
+                descricoes[ordinal].append(descricao)
+
+    if modo == 'uniao':
+        ordinais = list(descricoes)
+    elif modo == 'intersecao':
+        conjuntos = [set(calendario.ordinais) for calendario in calendarios]
+        ordinais = [ordinal for ordinal in descricoes if all(ordinal in conjunto for conjunto in conjuntos)]
+    else:
+        raise ValueError("Modo de combinação desconhecido: {}".format(modo))
+    return CalendarioFeriados(ordinais, [" / ".join(descricoes[ordinal]) for ordinal in ordinais])
+
+
+class RegistroCalendarios(object):
+    """
+    Registro de calendários de feriados nomeados (ex.: 'ANBIMA', 'B3', 'SAO_PAULO', 'EUA'). Cada arquivo de feriados é
+    carregado uma única vez (ver carrega_calendario()) e as combinações de calendários (uniao/intersecao) são
+    calculadas uma única vez e mantidas enquanto os arquivos de origem não forem alterados.
+
+    Exemplos
+    --------
+        >>> registro = FinDt.RegistroCalendarios()
+        >>> registro.registra('ANBIMA', "C:\\foo\\feriados_anbima.csv")
+        >>> registro.registra('EUA', "C:\\foo\\feriados_eua.csv")
+        >>> registro['ANBIMA'].conta_dias_uteis('01/01/2013', '31/12/2013')
+        >>> ambos = registro.uniao('ANBIMA', 'EUA')       # dia útil nos dois mercados
+        >>> periodo = FinDt.DatasFinanceiras('01/01/2013', '28/02/2013', calendario=ambos)
+    """
+
+    def __init__(self):
+        self._fontes = {}
+        self._combinados = {}
+        self._lock = threading.Lock()
+
+    def registra(self, nome, path_arquivo=None, calendario=None):
         """
+        Registra um calendário sob um nome, a partir de um arquivo de feriados (csv ou binário) ou de uma instância
+        de CalendarioFeriados.
 
-        Converte o separador de data de diversos formatos no separador padrao "/".
+        Parametros
+        ----------
+            nome - cadeia de caracteres (string) que identifica o calendário.
 
+            path_arquivo - (OPCIONAL) caminho (path) para o arquivo de feriados.
+
+            calendario - (OPCIONAL) instância de CalendarioFeriados, em substituição a path_arquivo.
         """
-        if self._data is not None:
-            try:
-                data_mask = re.compile(r'^(\d{2})\D*(\d{2})\D*(\d{4})$')
-                partes = data_mask.search(self._data).groups()
-                return "{}/{}/{}".format(partes[0], partes[1], partes[2])
-            except AttributeError as AttErr:
-                print("Separador Indefinido: {}".format(str(AttErr)))
-                return
-            except TypeError as TyErr:
-                print("O parametro deve ser uma string: {}".format(str(TyErr)))
-                return
-        else:
-            return None
+        if (path_arquivo is None) == (calendario is None):
+            raise ValueError("Informe um path_arquivo ou um calendario!")
+        with self._lock:
+            self._fontes[nome] = calendario if calendario is not None else Path(path_arquivo)
 
-    def str_para_data(self):
+    def nomes(self):
+        """
+        Retorna a lista dos nomes dos calendários registrados.
         """
+        with self._lock:
+            return list(self._fontes)
 
-        Transforma uma Data do formato String para formato Date
+    def calendario(self, nome):
+        """
+        Retorna o CalendarioFeriados registrado sob 'nome'.
+        """
+        with self._lock:
+            if nome not in self._fontes:
+                raise KeyError("Calendario nao registrado: {}".format(nome))
+            fonte = self._fontes[nome]
+        if isinstance(fonte, CalendarioFeriados):
+            return fonte
+        return carrega_calendario(fonte)
+
+    __getitem__ = calendario
+
+    def __contains__(self, nome):
+        return nome in self._fontes
+
+    def _combinado(self, modo, nomes):
+        calendarios = [self.calendario(nome) for nome in nomes]
+        chave = (modo, tuple(nomes))
+        # os calendários de origem fazem parte da entrada do cache: se algum arquivo for recarregado, a combinação
+        # é recalculada
+        with self._lock:
+            entrada = self._combinados.get(chave)
+            if entrada is not None and all(a is b for a, b in zip(entrada[0], calendarios)):
+                return entrada[1]
+        combinado = combina_calendarios(calendarios, modo)
+        with self._lock:
+            self._combinados[chave] = (calendarios, combinado)
+        return combinado
+
+    def uniao(self, *nomes):
+        """
+        Retorna o calendário com a união dos feriados dos calendários 'nomes': dia útil é o dia útil em todos eles.
+        """
+        return self._combinado('uniao', nomes)
 
+    def intersecao(self, *nomes):
+        """
+        Retorna o calendário com a interseção dos feriados dos calendários 'nomes': dia útil é o dia útil em pelo
+        menos um deles.
         """
+        return self._combinado('intersecao', nomes)
 
-        if self._data is not None:
-            if type(self._data) is date:
-                return self._data
-            elif type(self._data) is str:
-                partes = self.normaliza_data().split("/")
-                return date(int(partes[2]), int(partes[1]), int(partes[0]))
+
+registro_calendarios = RegistroCalendarios()
+
+
+# métodos de CalendarioFeriados que podem ser executados em lote por ExecutorCalendario
+_OPERACOES_LOTE = ('conta_dias_uteis', 'eh_dia_util', 'add_dias_uteis', 'proximo_dia_util', 'dia_util_anterior',
+                   'ajusta_dia_util', 'primeiro_dia_util_mes', 'ultimo_dia_util_mes')
+
+# calendário de cada processo de um ExecutorCalendario com processos (definido por _inicializa_processo)
+_calendario_processo = None
+
+
+def _inicializa_processo(calendario):
+    global _calendario_processo
+    _calendario_processo = calendario
+
+
+def _executa_bloco(calendario, operacao, bloco):
+    """
+    Executa a operação 'operacao' do calendário para cada tupla de argumentos do bloco e retorna a lista dos
+    resultados, na mesma ordem. Sem calendário, usa o calendário do processo (ver _inicializa_processo).
+    """
+    metodo = getattr(calendario if calendario is not None else _calendario_processo, operacao)
+    return [metodo(*argumentos) for argumentos in bloco]
+
+
+class ExecutorCalendario(object):
+    """
+    Executor de consultas de dias úteis em lote, que divide listas de consultas em blocos e os distribui por um
+    pool de threads ou de processos (concurrent.futures), retornando os resultados na ordem das consultas.
+
+    Com processos, o calendário é enviado uma única vez a cada processo (na sua inicialização) e, se tiver sido
+    carregado de um arquivo, é recarregado a partir do caminho do arquivo (ver CalendarioFeriados). Como as
+    consultas são operações Python de custo constante, o pool de threads é útil principalmente para compartilhar
+    o executor entre as threads de um serviço; o paralelismo efetivo de CPU é obtido com processos.
+
+    Parametros
+    ----------
+        calendario - instância de CalendarioFeriados (ou o caminho (path) para um arquivo de feriados).
+
+        max_workers - (OPCIONAL) numero máximo de threads ou processos do pool.
+
+        processos - (OPCIONAL) se True, usa um ProcessPoolExecutor; caso contrário, um ThreadPoolExecutor.
+
+        tamanho_bloco - (OPCIONAL) numero de consultas de cada tarefa enviada ao pool.
+
+    Exemplo
+    -------
+        >>> with FinDt.ExecutorCalendario(var_path, processos=True) as executor:
+        ...     executor.executa('conta_dias_uteis', [('01/01/2013', '31/12/2013'), ('01/02/2013', '28/02/2013')])
+        [..., ...]
+    """
+
+    def __init__(self, calendario, max_workers=None, processos=False, tamanho_bloco=1000):
+        if not isinstance(calendario, CalendarioFeriados):
+            calendario = carrega_calendario(calendario)
+        self._calendario = calendario
+        self._processos = processos
+        self._tamanho_bloco = tamanho_bloco
+        # importado sob demanda: concurrent.futures.process é uma parte relevante do tempo de importação
+        from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+        if processos:
+            self._pool = ProcessPoolExecutor(max_workers=max_workers, initializer=_inicializa_processo,
+                                             initargs=(calendario,))
         else:
-            return None
+            self._pool = ThreadPoolExecutor(max_workers=max_workers)
 
-    def data_para_str(self):
+    @property
+    def calendario(self):
+        return self._calendario
+
+    def executa(self, operacao, argumentos):
         """
-        Transforma uma Data no formato Date para formato String.
+        Executa, em paralelo, uma operação do calendário para cada tupla de argumentos e retorna a lista dos
+        resultados, na ordem de 'argumentos'.
+
+        Parametros
+        ----------
+            operacao - nome do método de CalendarioFeriados a executar: 'conta_dias_uteis', 'eh_dia_util',
+                'add_dias_uteis', 'proximo_dia_util', 'dia_util_anterior', 'ajusta_dia_util',
+                'primeiro_dia_util_mes' ou 'ultimo_dia_util_mes'.
 
+            argumentos - sequência de tuplas com os argumentos de cada consulta (ex.: (data_inicio, data_fim)).
         """
+        if operacao not in _OPERACOES_LOTE:
+            raise ValueError("Operação não suportada em lote: {}".format(operacao))
+        argumentos = list(argumentos)
+        blocos = [argumentos[pos:pos + self._tamanho_bloco] for pos in range(0, len(argumentos), self._tamanho_bloco)]
+        calendario = None if self._processos else self._calendario
+        resultados = []
+        for resultado_bloco in self._pool.map(_executa_bloco, [calendario] * len(blocos), [operacao] * len(blocos),
+                                              blocos):
+            resultados.extend(resultado_bloco)
+        return resultados
+
+    def fecha(self):
+        """
+        Encerra o pool de threads/processos.
+        """
+        self._pool.shutdown()
 
-        if self._data is not None:
-            if type(self._data) is str:
-                self._data = self.normaliza_data()
-                return self._data
-            elif type(self._data) is date:
-                return self._data.strftime("%d/%m/%Y")
-        else:
-            return None
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fecha()
 
 
 class DatasFinanceiras(FormataData):
@@ -121,6 +1503,15 @@ class DatasFinanceiras(FormataData):
             Apos a conversao, excluir o cabecalho (primeira linha) e informacoes adicionais (ultimas quatro ou cinco
             linhas) para o arquivo manter somente os dados que nos interessam - data, dia da semana e nomemclatura do
             feriado.
+            Alternativamente, path_arquivo pode ser um arquivo binário gerado a partir do csv pela função
+            compila_calendario(), cuja carga é praticamente instantânea.
+
+            calendario - (OPCIONAL) instância de CalendarioFeriados (ex.: obtida de um RegistroCalendarios, inclusive
+            combinações de calendários), usada no lugar do arquivo 'path_arquivo'.
+
+            lazy - (OPCIONAL) se True, a lista de datas do periodo (_ListaDatas) não é construída: somente os ordinais
+            das datas inicial e final são armazenados, e os métodos respondem aritmeticamente ou geram as datas apenas
+            quando solicitadas. O padrão (False) mantém o comportamento anterior.
 
         Exemplos
         --------
@@ -181,43 +1572,98 @@ class DatasFinanceiras(FormataData):
                 >>> periodo.primeiro_dia_mes('23/02/2015')  # formato datetime.date(aaaa, mm, dd)
             ou
                 >>> periodo.ultimo_dia_mes('23/02/2015', 'str')  # formato string 'dd/mm/aaaa'
+            ou, de forma análoga, do trimestre ou do ano, ou o primeiro/último dia útil do mês:
+                >>> periodo.ultimo_dia_trimestre('23/02/2015')
+                >>> periodo.primeiro_dia_ano('23/02/2015')
+                >>> periodo.ultimo_dia_util_mes('23/02/2015')
 
 
             8- Gerando uma lista que representa um subperiodo de dias de DatasFinanceiras:
 
                 >>> periodo.subperiodo('15/01/2013', '15/02/2013')
+            ou, sem gerar a lista, uma visão do subperiodo (também um DatasFinanceiras):
+                >>> periodo.visao('15/01/2013', '15/02/2013').dias(3)
 
             9- Obtendo um dicionario ordenado 'Mes/Ano':
                 (key : value = (Mes/Ano) : (dias uteis por mes))
 
                >>> periodo.dias_uteis_por_mes()
+            ou, por semana, trimestre ou ano:
+               >>> periodo.dias_uteis_por_semana()
+               >>> periodo.dias_uteis_por_trimestre()
+               >>> periodo.dias_uteis_por_ano()
+
+            10- Obtendo o numero de dias do periodo, sem gerar a lista de dias:
+
+               >>> periodo.conta_dias(3)       # equivale a len(periodo.dias(3))
+
+            11- Criando um periodo "preguiçoso" (lazy), que não constrói a lista de datas:
+
+               >>> periodo = FinDt.DatasFinanceiras('01/01/1990', '31/12/2019', path_arquivo=var_path, lazy=True)
+               >>> len(periodo)                        # numero de dias corridos
+               >>> FinDt.date(2013, 1, 15) in periodo  # pertinencia
+               >>> for dia in periodo: ...             # datas geradas sob demanda
+
+            12- Gerando os dias sob demanda (sem construir listas):
+
+               >>> for dia in periodo.itera_dias(3, 'str'): ...
+               >>> periodo.itera_dia_especifico_semana(5)
+               >>> periodo.itera_feriados()
     """
 
-    def __init__(self, data_inicio=None, data_fim=None, num_dias=None, path_arquivo=''):
+    @_instrumentado()
+    def __init__(self, data_inicio=None, data_fim=None, num_dias=None, path_arquivo='', lazy=False, calendario=None):
         super().__init__()
         if data_inicio is None:
             raise ValueError('A Data Inicial e imprescindivel!!!')
         else:
-            self._cData_Inicio = FormataData(data_inicio).str_para_data()
+            self._cData_Inicio = _para_data(data_inicio)
 
             if data_fim is None and num_dias is None:
                 raise ValueError("Uma data final ou número de dias tem que ser fornecido!")
             else:
                 if data_fim is not None:
-                    self._cData_Fim = FormataData(data_fim).str_para_data()
-                    self._ListaDatas = [self._cData_Inicio + timedelta(x)
-                                        for x in range(0, abs(int((self._cData_Fim - self._cData_Inicio).days) + 1))]
+                    self._cData_Fim = _para_data(data_fim)
+                    self._ord_ini = self._cData_Inicio.toordinal()
+                    self._ord_fim = self._ord_ini + abs(int((self._cData_Fim - self._cData_Inicio).days) + 1) - 1
                 elif num_dias is not None:
                     self._cNum_Dias = num_dias
                     if self._cNum_Dias >= 1:
-                        self._ListaDatas = [self._cData_Inicio + timedelta(x) for x in range(0, abs(self._cNum_Dias))]
+                        self._ord_ini = self._cData_Inicio.toordinal()
+                        self._ord_fim = self._ord_ini + self._cNum_Dias - 1
+                    elif self._cNum_Dias < 0:
+                        self._ord_fim = self._cData_Inicio.toordinal()
+                        self._ord_ini = self._ord_fim - abs(self._cNum_Dias) + 1
                     else:
-                        self._ListaDatas = [
-                            (self._cData_Inicio - timedelta(days=abs(self._cNum_Dias) - 1) + timedelta(x))
-                            for x in range(0, abs(self._cNum_Dias))]
-                    self._cData_Fim = self._ListaDatas[-1]
+                        raise ValueError("O número de dias não pode ser zero!")
+                    self._cData_Fim = date.fromordinal(self._ord_fim)
         self._cPath_Arquivo = Path(path_arquivo)
+        self._calendario = calendario
+        self._lista_datas = None
+        if not lazy:
+            self._lista_datas = self._ListaDatas
+
+    @property
+    def _ListaDatas(self):
+        """
+        Lista (datetime.date) de todos os dias do periodo. Em um periodo lazy, é construída somente no primeiro acesso.
+        """
+        if self._lista_datas is None:
+            self._lista_datas = [date.fromordinal(ordinal) for ordinal in range(self._ord_ini, self._ord_fim + 1)]
+        return self._lista_datas
+
+    def __len__(self):
+        return max(self._ord_fim - self._ord_ini + 1, 0)
+
+    def __contains__(self, data):
+        return self._ord_ini <= _para_data(data).toordinal() <= self._ord_fim
+
+    def __iter__(self):
+        if self._lista_datas is not None:
+            return iter(self._lista_datas)
+        return (date.fromordinal(ordinal) for ordinal in range(self._ord_ini, self._ord_fim + 1))
 
+    @_instrumentado()
     def dias(self, opt=1, dt_type='date'):
         """
         Cria uma lista de Dias entre uma data inicial e uma data final.
@@ -235,20 +1681,60 @@ class DatasFinanceiras(FormataData):
         """
 
         if dt_type == 'date':
-            if opt == 1:
-                return [dia for dia in self._ListaDatas]
-            elif opt == 2:
-                return [dia for dia in self._ListaDatas if
-                        (dia.isoweekday() != 6 and dia.isoweekday() != 7)]
-            elif opt == 3:
-                if self._cPath_Arquivo is None:
-                    raise ValueError('E necessario um path/arquivo!')
-                else:
-                    return [dia for dia in self.dias(opt=2) if
-                            dia not in self.lista_feriados()]
+            return self._dias(opt)
         elif dt_type == 'str':
-            return [FormataData(dia).data_para_str() for dia in self.dias(opt, dt_type='date')]
+            return [_data_para_str(dia) for dia in self._dias(opt)]
+
+    def _dias(self, opt):
+        """
+        Implementação de dias() para dt_type='date' (chamada diretamente, sem passar pela instrumentação).
+        """
+        if opt == 1:
+            return [dia for dia in self]
+        elif opt == 2:
+            mascara = _mascara_dias_semana(self._ord_ini, len(self))
+            return [date.fromordinal(ordinal)
+                    for ordinal in _ordinais_da_mascara(mascara, self._ord_ini, len(self))]
+        elif opt == 3:
+            if self._cPath_Arquivo is None:
+                raise ValueError('E necessario um path/arquivo!')
+            else:
+                mascara = self.calendario.mascara_dias_uteis(self._ord_ini, self._ord_fim)
+                return [date.fromordinal(ordinal)
+                        for ordinal in _ordinais_da_mascara(mascara, self._ord_ini, len(self))]
+
+    @_instrumentado()
+    def conta_dias(self, opt=1):
+        """
+        Retorna o numero de dias do periodo, sem construir a lista de dias. Equivale a len(self.dias(opt)).
+
+        Parametros
+        ----------
+            opt - (OPICIONAL) Permite selecionar entre 3 opcoes de contagem:
+                Opcao 1: dias corridos (incluindo sabados, domingos e feriados).
+                Opcao 2: dias excluindo sabados e domingos.
+                Opcao 3: dias excluindo sabados e domingos e feriados (usa o indice de dias uteis do calendario).
+        """
+        ord_ini = self._ord_ini
+        ord_fim = self._ord_fim
+        if opt == 1:
+            return len(self)
+        elif opt == 2:
+            return _dias_semana_ate(ord_fim) - _dias_semana_ate(ord_ini - 1)
+        elif opt == 3:
+            return self.calendario._conta_uteis(ord_ini, ord_fim)
+
+    @property
+    def calendario(self):
+        """
+        O CalendarioFeriados (compartilhado) informado na criação do periodo ou, na sua ausência, o correspondente
+        ao arquivo de feriados 'path_arquivo'.
+        """
+        if self._calendario is not None:
+            return self._calendario
+        return carrega_calendario(self._cPath_Arquivo)
 
+    @_instrumentado()
     def lista_feriados(self, dt_type='date'):
         """
         Cria um Dicionario ou uma Lista com os feriados entre a Data Inicial e a Data Final.
@@ -265,21 +1751,19 @@ class DatasFinanceiras(FormataData):
                 Opção str:  retorna datas no formato string "dd/mm/aaaa"
         """
         try:
-            with open(self._cPath_Arquivo, 'r', encoding="ISO-8859-1") as csvfile:
-                feriados = csv.reader(csvfile, dialect='excel', delimiter=';')
-                dic_selic = {FormataData(row[0]).str_para_data(): row[2] for row in feriados}
+            feriados = self.calendario.feriados_entre(self._ord_ini, self._ord_fim)
 
             if dt_type == 'date':
-                return OrderedDict(sorted({dt: dic_selic[dt] for dt in self._ListaDatas if
-                                           dt in dic_selic}.items(), key=lambda t: t[0]))
+                return OrderedDict((date.fromordinal(ordinal), descricao) for ordinal, descricao in feriados)
             elif dt_type == 'str':
-                return OrderedDict(sorted({FormataData(dt).data_para_str(): dic_selic[dt] for dt in self._ListaDatas if
-                                           dt in dic_selic}.items(), key=lambda t: t[0]))
+                return OrderedDict(sorted({_data_para_str(date.fromordinal(ordinal)): descricao
+                                           for ordinal, descricao in feriados}.items(), key=lambda t: t[0]))
         except IOError as IOerr:
             print("Erro de leitura do arquivo:" + str(IOerr))
         except KeyError as Kerr:
             print("Erro na chave do Dicionario" + str(Kerr))
 
+    @_instrumentado()
     def lista_dia_especifico_semana(self, dia_da_semana=1, dt_type='date'):
         """
         Cria uma Lista com os dias em que um determinado dia da semana se repete entre a Data Inicial e a Data Final.
@@ -299,22 +1783,76 @@ class DatasFinanceiras(FormataData):
                 Opção date: retorna datas no formato datetime.date(aaaa, mm, dd) do python
                 Opção str:  retorna datas no formato string "dd/mm/aaaa"
         """
+        if dia_da_semana not in range(1, 8):
+            return []
+        # o primeiro ordinal do periodo que cai no dia da semana desejado; os demais estão a cada 7 dias
+        primeiro = self._ord_ini + (dia_da_semana - (self._ord_ini - 1) % 7 - 1) % 7
         if dt_type == 'date':
-            return [dia for dia in self._ListaDatas if dia.isoweekday() == dia_da_semana]
+            return [date.fromordinal(ordinal) for ordinal in range(primeiro, self._ord_fim + 1, 7)]
         elif dt_type == 'str':
-            return [FormataData(dia).data_para_str() for dia in self._ListaDatas if dia.isoweekday() == dia_da_semana]
+            return [_data_para_str(date.fromordinal(ordinal))
+                    for ordinal in range(primeiro, self._ord_fim + 1, 7)]
+
+    def itera_dias(self, opt=1, dt_type='date'):
+        """
+        Versão geradora de dias(): gera os dias do periodo sob demanda, sem construir a lista. Os parametros são os
+        mesmos de dias().
+        """
+        calendario = self.calendario if opt == 3 else None
+        for ordinal in _itera_ordinais(self._ord_ini, self._ord_fim, opt, calendario):
+            yield _converte_data(date.fromordinal(ordinal), dt_type)
+
+    def itera_dia_especifico_semana(self, dia_da_semana=1, dt_type='date'):
+        """
+        Versão geradora de lista_dia_especifico_semana(): gera as datas sob demanda, sem construir a lista. Os
+        parametros são os mesmos de lista_dia_especifico_semana().
+        """
+        if dia_da_semana not in range(1, 8):
+            return
+        primeiro = self._ord_ini + (dia_da_semana - (self._ord_ini - 1) % 7 - 1) % 7
+        for ordinal in range(primeiro, self._ord_fim + 1, 7):
+            yield _converte_data(date.fromordinal(ordinal), dt_type)
+
+    def itera_feriados(self, dt_type='date'):
+        """
+        Versão geradora de lista_feriados(): gera, em ordem de data, as tuplas (data, feriado) do periodo, sem
+        construir o dicionario.
+        """
+        for ordinal, descricao in self.calendario.itera_feriados(self._ord_ini, self._ord_fim):
+            yield _converte_data(date.fromordinal(ordinal), dt_type), descricao
 
     @staticmethod
+    @_instrumentado()
     def dia_semana(data):
         """
-        Obtem o dia da semana a partir de uma data no formato String
+        Obtem o dia da semana a partir de uma data no formato String. O nome ('segunda-feira', ..., 'domingo') é
+        obtido da tabela DIAS_SEMANA e não depende do locale do sistema.
 
         Parametros
             data - cadeia de caracteres (string) que representa uma data no formato "xx/xx/xxxx"
         """
-        return FormataData(data).str_para_data().strftime("%A")
+        return DIAS_SEMANA[_para_data(data).isoweekday()]
+
+    @staticmethod
+    @_instrumentado()
+    def dias_semana(datas):
+        """
+        Versão em lote de dia_semana: retorna os nomes dos dias da semana ('segunda-feira', ..., 'domingo') de uma
+        sequência de datas (formato string ou datetime.date), em uma lista. Para um numpy.ndarray do tipo
+        datetime64, o cálculo é vetorizado e o resultado é um numpy.ndarray de strings.
+
+        Parametros
+            datas - numpy.ndarray do tipo datetime64 ou sequência de datas.
+        """
+        if _eh_datetime64(datas):
+            np = _numpy()
+            # 01/01/1970 (dia 0 de datetime64[D]) foi uma quinta-feira (isoweekday 4)
+            return np.array(DIAS_SEMANA[1:])[(datas.astype('datetime64[D]').astype('int64') + 3) % 7]
+        nomes = DIAS_SEMANA
+        return [nomes[data.isoweekday()] for data in parse_many(datas)]
 
     @staticmethod
+    @_instrumentado()
     def primeiro_dia_mes(data, dt_type='date'):
         """
         Fornecida uma data qualquer no formato string, retorna o primeiro dia do mes daquela data, tambem
@@ -328,12 +1866,10 @@ class DatasFinanceiras(FormataData):
                 Opção date: retorna datas no formato datetime.date(aaaa, mm, dd) do python
                 Opção str:  retorna datas no formato string "dd/mm/aaaa"
         """
-        if dt_type == 'date':
-            return FormataData(FormataData(data).str_para_data().strftime("01/%m/%Y")).str_para_data()
-        elif dt_type == 'str':
-            return FormataData(data).str_para_data().strftime("01/%m/%Y")
+        return _converte_data(_para_data(data).replace(day=1), dt_type)
 
     @staticmethod
+    @_instrumentado()
     def ultimo_dia_mes(data, dt_type='date'):
         """
         Fornecida uma data qualquer no formato string, retorna o ultimo dia do mes daquela data, tambem
@@ -347,43 +1883,177 @@ class DatasFinanceiras(FormataData):
                 Opção date: retorna datas no formato datetime.date(aaaa, mm, dd) do python
                 Opção str:  retorna datas no formato string "dd/mm/aaaa"
         """
-        data_seguinte = FormataData(data).str_para_data()
-        while data_seguinte.month == FormataData(data).str_para_data().month:
-            data_seguinte = date.fromordinal(data_seguinte.toordinal() + 1)
-        if dt_type == 'date':
-            return date.fromordinal(data_seguinte.toordinal() - 1)
-        elif dt_type == 'str':
-            return FormataData(date.fromordinal(data_seguinte.toordinal() - 1)).data_para_str()
+        return _converte_data(date.fromordinal(_fim_mes(_para_data(data))), dt_type)
+
+    @staticmethod
+    @_instrumentado()
+    def primeiro_dia_trimestre(data, dt_type='date'):
+        """
+        Fornecida uma data qualquer (formato string ou datetime.date), retorna o primeiro dia do trimestre
+        daquela data.
+
+        Parametros
+        ----------
+            data - a data para a qual se deseja obter o primeiro dia do trimestre.
+
+            dt_type - (OPICIONAL) 'date' ou 'str'.
+        """
+        return _converte_data(date.fromordinal(_limites_trimestre(_para_data(data))[0]), dt_type)
+
+    @staticmethod
+    @_instrumentado()
+    def ultimo_dia_trimestre(data, dt_type='date'):
+        """
+        Fornecida uma data qualquer (formato string ou datetime.date), retorna o ultimo dia do trimestre
+        daquela data.
+
+        Parametros
+        ----------
+            data - a data para a qual se deseja obter o ultimo dia do trimestre.
+
+            dt_type - (OPICIONAL) 'date' ou 'str'.
+        """
+        return _converte_data(date.fromordinal(_limites_trimestre(_para_data(data))[1]), dt_type)
+
+    @staticmethod
+    @_instrumentado()
+    def primeiro_dia_ano(data, dt_type='date'):
+        """
+        Fornecida uma data qualquer (formato string ou datetime.date), retorna o primeiro dia do ano daquela data.
+        """
+        return _converte_data(date(_para_data(data).year, 1, 1), dt_type)
+
+    @staticmethod
+    @_instrumentado()
+    def ultimo_dia_ano(data, dt_type='date'):
+        """
+        Fornecida uma data qualquer (formato string ou datetime.date), retorna o ultimo dia do ano daquela data.
+        """
+        return _converte_data(date(_para_data(data).year, 12, 31), dt_type)
+
+    @_instrumentado()
+    def primeiro_dia_util_mes(self, data, dt_type='date'):
+        """
+        Fornecida uma data qualquer (formato string ou datetime.date), retorna o primeiro dia útil (sem sábados,
+        domingos e feriados) do mês daquela data. Ver CalendarioFeriados.primeiro_dia_util_mes.
+        """
+        return self.calendario.primeiro_dia_util_mes(data, dt_type)
+
+    @_instrumentado()
+    def ultimo_dia_util_mes(self, data, dt_type='date'):
+        """
+        Fornecida uma data qualquer (formato string ou datetime.date), retorna o ultimo dia útil (sem sábados,
+        domingos e feriados) do mês daquela data. Ver CalendarioFeriados.ultimo_dia_util_mes.
+        """
+        return self.calendario.ultimo_dia_util_mes(data, dt_type)
+
+    def _dias_uteis_por_periodo(self, limites_periodo):
+        """
+        Percorre, em uma única passagem, os periodos (semanas, meses, ...) que intersectam o periodo principal e
+        retorna uma lista de tuplas (chave, dias uteis). Os dias uteis de cada periodo são contados no indice do
+        calendario, limitados ao periodo principal.
+
+        Parametros
+        ----------
+            limites_periodo - função que, dada uma data, retorna a tupla (ordinal inicial, ordinal final, chave) do
+                periodo que a contém.
+        """
+        calendario = self.calendario
+        lista_periodo_dias_uteis = []
+        ordinal = self._ord_ini
+        while ordinal <= self._ord_fim:
+            ord_ini, ord_fim, chave = limites_periodo(date.fromordinal(ordinal))
+            ord_fim = min(ord_fim, self._ord_fim)
+            lista_periodo_dias_uteis.append((chave, calendario._conta_uteis(ordinal, ord_fim)))
+            ordinal = ord_fim + 1
+        return lista_periodo_dias_uteis
+
+    @_instrumentado()
+    def dias_uteis_por_semana(self):
+        """
+        Cria um dicionario ordenado contendo o numero de dias uteis (sem sabados, domingos e feriados) de cada semana
+        (ISO 8601, de segunda-feira a domingo) entre uma data inicial e uma data final.
+        (key : value = (Semana/Ano) : (dias uteis por semana))
 
+        """
+        return OrderedDict(self._dias_uteis_por_periodo(_limites_semana))
+
+    @_instrumentado()
     def dias_uteis_por_mes(self):
         """
         Cria um dicionario contendo o numero de dias uteis (sem sabados, domingos e feriados) mensais entre uma
         data inicial e uma data final.
 
+        Os dias contados são os do periodo (os de self.dias(1)). Assim, com uma data final anterior a data inicial,
+        são contados os meses do periodo de abs((data_fim - data_inicio).days + 1) dias a partir da data inicial
+        (a versão anterior retornava, nesse caso, um dicionario vazio ou incompleto).
+
+        """
+        return OrderedDict(sorted(self._dias_uteis_por_periodo(_limites_mes), key=lambda t: t[0]))
+
+    @_instrumentado()
+    def dias_uteis_por_trimestre(self):
+        """
+        Cria um dicionario ordenado contendo o numero de dias uteis (sem sabados, domingos e feriados) de cada
+        trimestre entre uma data inicial e uma data final.
+        (key : value = (Trimestre/Ano, ex.: '1T/2013') : (dias uteis por trimestre))
+
+        """
+        return OrderedDict(self._dias_uteis_por_periodo(_limites_trimestre))
+
+    @_instrumentado()
+    def dias_uteis_por_ano(self):
         """
+        Cria um dicionario ordenado contendo o numero de dias uteis (sem sabados, domingos e feriados) de cada
+        ano entre uma data inicial e uma data final.
+        (key : value = (Ano) : (dias uteis por ano))
 
-        lista_mes_dias_uteis = []
+        """
+        return OrderedDict(self._dias_uteis_por_periodo(_limites_ano))
 
-        for dia in self._ListaDatas:
-            if dia == self.ultimo_dia_mes(dia):
-                if self.primeiro_dia_mes(dia) < self._cData_Inicio:
-                    dias_uteis_do_mes = DatasFinanceiras(self._cData_Inicio, self.ultimo_dia_mes(dia, 'str'),
-                                                         path_arquivo=self._cPath_Arquivo)
-                    lista_mes_dias_uteis.append(
-                        ("{}".format(dia.strftime("%m/%Y")), len(dias_uteis_do_mes.dias(opt=3))))
-                else:
-                    dias_uteis_do_mes = DatasFinanceiras(self.primeiro_dia_mes(dia, 'str'),
-                            self.ultimo_dia_mes(dia, 'str'), path_arquivo=self._cPath_Arquivo)
-                    lista_mes_dias_uteis.append(
-                        ("{}".format(dia.strftime("%m/%Y")), len(dias_uteis_do_mes.dias(opt=3))))
-            elif dia == self._cData_Fim:
-                dias_uteis_do_mes = DatasFinanceiras(self.primeiro_dia_mes(dia, 'str'), self._cData_Fim,
-                                                     path_arquivo=self._cPath_Arquivo)
-                lista_mes_dias_uteis.append(
-                    ("{}".format(dia.strftime("%m/%Y")), len(dias_uteis_do_mes.dias(opt=3))))
+    @classmethod
+    def _de_ordinais(cls, ord_ini, ord_fim, path_arquivo, calendario):
+        """
+        Cria um periodo lazy diretamente a partir dos ordinais das datas inicial e final, sem conversões de datas.
+        """
+        periodo = cls.__new__(cls)
+        FormataData.__init__(periodo)
+        periodo._cData_Inicio = date.fromordinal(ord_ini)
+        periodo._cData_Fim = date.fromordinal(ord_fim)
+        periodo._ord_ini = ord_ini
+        periodo._ord_fim = ord_fim
+        periodo._cPath_Arquivo = path_arquivo
+        periodo._calendario = calendario
+        periodo._lista_datas = None
+        return periodo
+
+    @_instrumentado()
+    def visao(self, data_inicio=None, data_fim=None):
+        """
+        Retorna um subperiodo do periodo principal na forma de uma visão: um DatasFinanceiras lazy que guarda apenas
+        os ordinais das suas datas inicial e final e compartilha o arquivo de feriados/calendario do periodo
+        principal. Nenhuma data é copiada; os limites são verificados aritmeticamente. Todos os métodos de
+        DatasFinanceiras (dias, lista_feriados, conta_dias, ...) estão disponíveis na visão.
 
-        return OrderedDict(sorted({per[0]: per[1] for per in lista_mes_dias_uteis}.items(), key=lambda t: t[0]))
+        Parametros
+        ----------
+            data_inicio - (OPICIONAL) a data inicial do subperiodo (inclusive), no formato string "xx/xx/xxxx" ou
+                datetime.date; na sua ausência, a data inicial do periodo principal.
 
+            data_fim - (OPICIONAL) a data final do subperiodo (inclusive), no formato string "xx/xx/xxxx" ou
+                datetime.date; na sua ausência, a data final do periodo principal.
+        """
+        ord_ini = self._ord_ini if data_inicio is None else _para_data(data_inicio).toordinal()
+        ord_fim = self._ord_fim if data_fim is None else _para_data(data_fim).toordinal()
+        if not self._ord_ini <= ord_ini <= self._ord_fim:
+            raise ValueError("Data Inicial do subperiodo fora do conjunto de dias do periodo principal!")
+        if not self._ord_ini <= ord_fim <= self._ord_fim:
+            raise ValueError("Data Final do subperiodo fora do conjunto de dias do periodo principal!")
+        if ord_fim < ord_ini:
+            raise ValueError("Data Final do subperiodo anterior a Data Inicial do subperiodo!")
+        return DatasFinanceiras._de_ordinais(ord_ini, ord_fim, self._cPath_Arquivo, self._calendario)
+
+    @_instrumentado()
     def subperiodo(self, data_inicio=None, data_fim=None, num_dias=1, dt_type='date'):
         """
 
@@ -395,16 +2065,17 @@ class DatasFinanceiras(FormataData):
         A Data Inicial do subperiodo tem que ser maior ou igual a Data Inicial do Periodo Principal.
         A Data Final do subperiodo tem que ser menor ou igual a Data Final do Periodo Principal.
         Se Data Inicial e/ou Data Final estiverem fora dos limites do Periodo Principal, um ValueError será gerado.
-        Se uma Data Inicial e uma Data Final não forem especificados, subperiodo será igual ao
-        Período Principal (DatasFinanceiras).
+        Se uma Data Inicial e/ou uma Data Final não forem especificadas, serão usadas, respectivamente, a Data
+        Inicial e/ou a Data Final do Período Principal (DatasFinanceiras).
+        Para obter o subperiodo como um DatasFinanceiras (sem gerar a lista de dias), use o método visao().
 
         Parametros
         ----------
-            data_inicio - (OBRIGATORIO) cadeia de caracteres (string) que representa uma data no formato "xx/xx/xxxx";
+            data_inicio - (OPICIONAL) cadeia de caracteres (string) que representa uma data no formato "xx/xx/xxxx";
                 a data inicial do periodo desejado (inclusive).
 
             data_fim - (OPICIONAL) cadeia de caracteres (string) que representa uma data no formato "xx/xx/xxxx";
-                a data final do periodo desejado (exclusive).
+                a data final do periodo desejado (inclusive).
 
             num_dias - (OPICIONAL) numero inteiro que representa o numero de dias desejados, em substituicao ao
                 argumento Data_Fim.
@@ -414,20 +2085,7 @@ class DatasFinanceiras(FormataData):
                 Opção str:  retorna datas no formato string "dd/mm/aaaa"
 
         """
-        if data_inicio is None or data_fim is None:
-            subper = DatasFinanceiras(self._cData_Inicio, self._cData_Fim, self._cNum_Dias,
-                                      path_arquivo=self._cPath_Arquivo)
-            return subper.dias(1, dt_type)
-        else:
-            if FormataData(data_inicio).str_para_data() in self._ListaDatas:
-                print("")
-                if FormataData(data_fim).str_para_data() in self._ListaDatas:
-                    subper = DatasFinanceiras(data_inicio, data_fim, path_arquivo=self._cPath_Arquivo)
-                    return subper.dias(1, dt_type)
-                else:
-                    raise ValueError("Data Final do subperiodo fora do conjunto de dias do periodo principal!")
-            else:
-                raise ValueError("Data Inicial do subperiodo fora do conjunto de dias do periodo principal!")
+        return self.visao(data_inicio, data_fim).dias(1, dt_type)
 
 
 def main():
@@ -0,0 +1,224 @@
+# -*- coding: UTF-8 -*-
+
+r"""Benchmarks dos pontos de entrada de DatasFinanceiras.
+
+Mede, com um arquivo de feriados sintetico no formato da 'Anbima' (ver feriados_sinteticos.py), o tempo de:
+construcao (normal e lazy), dias(1/2/3), lista_feriados, lista_dia_especifico_semana, ultimo_dia_mes,
+dias_uteis_por_semana/mes/trimestre/ano, subperiodo e dias_semana, para periodos de 1 mes a 50 anos e para os
+tipos de saida 'date' e 'str'. Mede tambem o tempo de importacao do modulo (em um processo novo), o de uma chamada
+isolada de dia_semana e o da carga do arquivo de feriados com o cache vazio, nos formatos csv e binario
+(compila_calendario), sozinha e seguida da primeira contagem de dias uteis (que constroi o indice).
+
+Os resultados (segundos por chamada, o melhor de algumas repeticoes) sao gravados em um relatorio JSON. Dois
+relatorios podem ser comparados; uma medicao mais lenta que a de referencia alem da tolerancia é sinalizada como
+regressao e o comando termina com codigo de saida 1.
+
+Uso:
+    python benchmarks/bench_findt.py executa --saida atual.json
+    python benchmarks/bench_findt.py compara referencia.json atual.json --tolerancia 0.25
+"""
+
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import FinDt
+from feriados_sinteticos import gera_feriados
+
+DATA_INICIO = date(2000, 1, 1)
+
+# (nome, numero de dias) dos periodos medidos
+PERIODOS = [('1m', 31), ('1a', 365), ('5a', 5 * 365), ('10a', 10 * 365), ('25a', 25 * 365), ('50a', 50 * 365)]
+
+TIPOS = ['date', 'str']
+
+
+def _casos(path_arquivo, num_dias, dt_type):
+    """
+    Retorna a lista de tuplas (nome, funcao) a medir para um periodo de 'num_dias' dias a partir de DATA_INICIO.
+    """
+    data_fim = DATA_INICIO + timedelta(num_dias - 1)
+    inicio = DATA_INICIO.strftime("%d/%m/%Y")
+    fim = data_fim.strftime("%d/%m/%Y")
+    meio = (DATA_INICIO + timedelta(num_dias // 2)).strftime("%d/%m/%Y")
+    periodo = FinDt.DatasFinanceiras(inicio, fim, path_arquivo=path_arquivo)
+    datas = periodo.dias(1, dt_type)
+
+    casos = [('dias(1)', lambda: periodo.dias(1, dt_type)),
+             ('dias(2)', lambda: periodo.dias(2, dt_type)),
+             ('dias(3)', lambda: periodo.dias(3, dt_type)),
+             ('lista_feriados', lambda: periodo.lista_feriados(dt_type)),
+             ('lista_dia_especifico_semana', lambda: periodo.lista_dia_especifico_semana(3, dt_type)),
+             ('ultimo_dia_mes', lambda: periodo.ultimo_dia_mes(meio, dt_type)),
+             ('subperiodo', lambda: periodo.subperiodo(meio, fim, dt_type=dt_type)),
+             ('dias_semana', lambda: FinDt.DatasFinanceiras.dias_semana(datas))]
+    if dt_type == 'date':
+        # construcao e agregacoes nao dependem do tipo de saida: medidos uma unica vez
+        casos += [('construcao', lambda: FinDt.DatasFinanceiras(inicio, fim, path_arquivo=path_arquivo)),
+                  ('construcao_lazy', lambda: FinDt.DatasFinanceiras(inicio, fim, path_arquivo=path_arquivo,
+                                                                     lazy=True)),
+                  ('dias_uteis_por_semana', periodo.dias_uteis_por_semana),
+                  ('dias_uteis_por_mes', periodo.dias_uteis_por_mes),
+                  ('dias_uteis_por_trimestre', periodo.dias_uteis_por_trimestre),
+                  ('dias_uteis_por_ano', periodo.dias_uteis_por_ano)]
+    return casos
+
+
+def _casos_carga(path_arquivo):
+    """
+    Retorna a lista de tuplas (nome, funcao) que medem a carga do arquivo de feriados 'path_arquivo' com o cache de
+    calendarios vazio: a carga sozinha e a carga seguida da primeira contagem de dias uteis.
+    """
+    def carga():
+        FinDt.limpa_cache_calendarios()
+        return FinDt.carrega_calendario(path_arquivo)
+
+    return [('carga_fria', carga),
+            ('carga_fria_conta_dias', lambda: carga().conta_dias_uteis(DATA_INICIO, DATA_INICIO + timedelta(365)))]
+
+
+def _mede(funcao, repeticoes):
+    """
+    Retorna o menor tempo por chamada (em segundos) entre 'repeticoes' medicoes de funcao.
+    """
+    temporizador = timeit.Timer(funcao)
+    numero, _ = temporizador.autorange()
+    return min(temporizador.repeat(repeat=repeticoes, number=numero)) / numero
+
+
+def _mede_importacao(repeticoes):
+    """
+    Retorna o menor tempo (em segundos) de 'import FinDt' entre 'repeticoes' processos Python novos, segundo o
+    relatorio de '-X importtime'.
+    """
+    diretorio = os.path.dirname(os.path.abspath(FinDt.__file__))
+    tempos = []
+    for _ in range(repeticoes):
+        saida = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import FinDt'], cwd=diretorio,
+                               stderr=subprocess.PIPE, universal_newlines=True, check=True).stderr
+        # formato: "import time: <proprio us> | <acumulado us> | <modulo>"
+        linha = [linha for linha in saida.splitlines() if linha.rstrip().endswith('| FinDt')][-1]
+        tempos.append(int(linha.split('|')[1]) / 1e6)
+    return min(tempos)
+
+
+def executa(path_saida, repeticoes=3, filtro=None):
+    """
+    Executa todos os benchmarks e grava o relatorio JSON em 'path_saida'.
+
+    Parametros
+    ----------
+        path_saida - caminho (path) do relatorio JSON.
+
+        repeticoes - (OPCIONAL) numero de medicoes de cada caso; é registrado o menor tempo.
+
+        filtro - (OPCIONAL) se informado, somente os casos cujo nome contenha este texto são medidos.
+    """
+    resultados = {}
+    casos_isolados = [('importacao|-|-', lambda: _mede_importacao(repeticoes)),
+                      ('dia_semana|-|date', lambda: _mede(lambda: FinDt.DatasFinanceiras.dia_semana(DATA_INICIO),
+                                                          repeticoes)),
+                      ('dia_semana|-|str', lambda: _mede(lambda: FinDt.DatasFinanceiras.dia_semana('01/01/2000'),
+                                                         repeticoes))]
+    for chave, medicao in casos_isolados:
+        if filtro is not None and filtro not in chave:
+            continue
+        resultados[chave] = medicao()
+        print("{:<45}{:>14.6f} ms".format(chave, resultados[chave] * 1000))
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        path_arquivo = os.path.join(diretorio, 'feriados.csv')
+        num_feriados = gera_feriados(path_arquivo)
+        path_binario = os.path.join(diretorio, 'feriados.fdc')
+        FinDt.compila_calendario(path_arquivo, path_binario)
+        for formato, path in [('csv', path_arquivo), ('binario', path_binario)]:
+            for nome_caso, funcao in _casos_carga(path):
+                chave = "{}|-|{}".format(nome_caso, formato)
+                if filtro is not None and filtro not in chave:
+                    continue
+                resultados[chave] = _mede(funcao, repeticoes)
+                print("{:<45}{:>14.6f} ms".format(chave, resultados[chave] * 1000))
+
+        for nome_periodo, num_dias in PERIODOS:
+            for dt_type in TIPOS:
+                for nome_caso, funcao in _casos(path_arquivo, num_dias, dt_type):
+                    chave = "{}|{}|{}".format(nome_caso, nome_periodo, dt_type)
+                    if filtro is not None and filtro not in chave:
+                        continue
+                    resultados[chave] = _mede(funcao, repeticoes)
+                    print("{:<45}{:>14.6f} ms".format(chave, resultados[chave] * 1000))
+
+    relatorio = {'meta': {'findt': FinDt.__version__,
+                          'python': platform.python_version(),
+                          'plataforma': platform.platform(),
+                          'data': time.strftime("%Y-%m-%dT%H:%M:%S"),
+                          'feriados': num_feriados,
+                          'repeticoes': repeticoes},
+                 'resultados': resultados}
+    with open(path_saida, 'w', encoding='utf-8') as arquivo:
+        json.dump(relatorio, arquivo, indent=2, sort_keys=True)
+    return relatorio
+
+
+def compara(path_referencia, path_atual, tolerancia=0.25):
+    """
+    Compara dois relatorios JSON e retorna a lista de regressoes (chave, tempo de referencia, tempo atual): casos em
+    que o tempo atual excede o de referencia em mais de 'tolerancia' (fração; 0.25 = 25%).
+    """
+    with open(path_referencia, encoding='utf-8') as arquivo:
+        referencia = json.load(arquivo)['resultados']
+    with open(path_atual, encoding='utf-8') as arquivo:
+        atual = json.load(arquivo)['resultados']
+
+    regressoes = []
+    print("{:<45}{:>14}{:>14}{:>10}".format('caso', 'ref. (ms)', 'atual (ms)', 'razao'))
+    for chave in sorted(set(referencia) & set(atual)):
+        razao = atual[chave] / referencia[chave] if referencia[chave] else float('inf')
+        marca = ''
+        if razao > 1 + tolerancia:
+            regressoes.append((chave, referencia[chave], atual[chave]))
+            marca = '  REGRESSAO'
+        print("{:<45}{:>14.6f}{:>14.6f}{:>10.2f}{}".format(chave, referencia[chave] * 1000, atual[chave] * 1000,
+                                                           razao, marca))
+    for chave in sorted(set(referencia) ^ set(atual)):
+        print("{:<45} presente em apenas um dos relatorios".format(chave))
+    return regressoes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks de FinDt.DatasFinanceiras")
+    comandos = parser.add_subparsers(dest='comando')
+    comandos.required = True
+
+    cmd_executa = comandos.add_parser('executa', help="executa os benchmarks e grava um relatorio JSON")
+    cmd_executa.add_argument('--saida', default='bench_findt.json', help="relatorio JSON de saida")
+    cmd_executa.add_argument('--repeticoes', type=int, default=3, help="medicoes por caso (registra a menor)")
+    cmd_executa.add_argument('--filtro', default=None, help="mede somente os casos cujo nome contenha este texto")
+
+    cmd_compara = comandos.add_parser('compara', help="compara dois relatorios JSON e sinaliza regressoes")
+    cmd_compara.add_argument('referencia', help="relatorio JSON de referencia")
+    cmd_compara.add_argument('atual', help="relatorio JSON a comparar")
+    cmd_compara.add_argument('--tolerancia', type=float, default=0.25,
+                             help="aumento relativo de tempo tolerado (padrao: 0.25)")
+
+    args = parser.parse_args()
+    if args.comando == 'executa':
+        executa(args.saida, args.repeticoes, args.filtro)
+    else:
+        regressoes = compara(args.referencia, args.atual, args.tolerancia)
+        if regressoes:
+            print("\n{} regressao(oes) encontrada(s).".format(len(regressoes)))
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
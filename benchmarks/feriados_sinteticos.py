@@ -0,0 +1,45 @@
+# -*- coding: UTF-8 -*-
+
+r"""Gerador de arquivos de feriados sinteticos, no formato da 'Anbima', para os benchmarks.
+
+O arquivo gerado segue o formato esperado por DatasFinanceiras (path_arquivo): csv separado por ponto e virgula,
+codificado em ISO-8859-1, com as colunas data ("dd/mm/aaaa"), dia da semana e descricao do feriado, sem cabecalho.
+"""
+
+import random
+from datetime import date, timedelta
+
+_FERIADOS_FIXOS = [(1, 1, 'Confraternização Universal'),
+                   (4, 21, 'Tiradentes'),
+                   (5, 1, 'Dia do Trabalho'),
+                   (9, 7, 'Independência do Brasil'),
+                   (10, 12, 'Nossa Sr.a Aparecida - Padroeira do Brasil'),
+                   (11, 2, 'Finados'),
+                   (11, 15, 'Proclamação da República'),
+                   (12, 25, 'Natal')]
+
+_DIAS_SEMANA = ['segunda-feira', 'terça-feira', 'quarta-feira', 'quinta-feira', 'sexta-feira', 'sábado', 'domingo']
+
+
+def gera_feriados(path_arquivo, ano_inicio=1970, ano_fim=2078, semente=0):
+    """
+    Grava em 'path_arquivo' um arquivo de feriados sinteticos entre ano_inicio e ano_fim (inclusive): os feriados
+    nacionais de data fixa e, para os moveis (Carnaval, Paixão de Cristo e Corpus Christi), datas pseudo-aleatorias
+    reprodutiveis a partir de 'semente'. Retorna o numero de feriados gravados.
+    """
+    aleatorio = random.Random(semente)
+    feriados = []
+    for ano in range(ano_inicio, ano_fim + 1):
+        for mes, dia, descricao in _FERIADOS_FIXOS:
+            feriados.append((date(ano, mes, dia), descricao))
+        carnaval = date(ano, 2, 2) + timedelta(aleatorio.randint(0, 35))
+        feriados.append((carnaval, 'Carnaval'))
+        feriados.append((carnaval + timedelta(1), 'Carnaval'))
+        feriados.append((carnaval + timedelta(46), 'Paixão de Cristo'))
+        feriados.append((carnaval + timedelta(108), 'Corpus Christi'))
+    feriados.sort()
+
+    with open(path_arquivo, 'w', encoding="ISO-8859-1") as csvfile:
+        for data, descricao in feriados:
+            csvfile.write("{};{};{}\n".format(data.strftime("%d/%m/%Y"), _DIAS_SEMANA[data.weekday()], descricao))
+    return len(feriados)
@@ -0,0 +1,50 @@
+# -*- coding: UTF-8 -*-
+
+import os
+import sys
+from datetime import date
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+
+import FinDt
+
+# feriados (data, descricao) padrão do arquivo gerado pela fixture path_arquivo
+FERIADOS = [(date(2013, 1, 1), 'Confraternização Universal'), (date(2013, 2, 11), 'Carnaval'),
+            (date(2013, 2, 12), 'Carnaval'), (date(2013, 3, 29), 'Paixão de Cristo'),
+            (date(2013, 4, 21), 'Tiradentes'), (date(2013, 12, 25), 'Natal')]
+
+
+@pytest.fixture
+def feriados():
+    """
+    Feriados (data, descricao) gravados por path_arquivo. Um módulo de testes que precise de outros feriados
+    redefine esta fixture (ou a parametriza com indirect=True).
+    """
+    return FERIADOS
+
+
+@pytest.fixture
+def cria_arquivo_feriados(tmp_path):
+    """
+    Fábrica de arquivos de feriados csv no formato da 'Anbima' (data;dia_da_semana;descricao, ISO-8859-1):
+    cria_arquivo_feriados(feriados, nome='feriados.csv') grava os feriados (data, descricao) em tmp_path e retorna o
+    caminho do arquivo. O cache de calendários é esvaziado ao final do teste.
+    """
+    def cria(feriados, nome='feriados.csv'):
+        path_arquivo = str(tmp_path / nome)
+        with open(path_arquivo, 'w', encoding='ISO-8859-1') as arquivo:
+            for feriado, descricao in feriados:
+                arquivo.write("{};{};{}\n".format(feriado.strftime("%d/%m/%Y"), feriado.isoweekday(), descricao))
+        return path_arquivo
+    yield cria
+    FinDt.limpa_cache_calendarios()
+
+
+@pytest.fixture
+def path_arquivo(cria_arquivo_feriados, feriados):
+    """
+    Caminho de um arquivo de feriados csv com os feriados da fixture 'feriados'.
+    """
+    return cria_arquivo_feriados(feriados)
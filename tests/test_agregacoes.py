@@ -0,0 +1,65 @@
+# -*- coding: UTF-8 -*-
+
+r"""Agregacoes de dias uteis (dias_uteis_por_semana/mes/trimestre/ano) comparadas com uma contagem dia a dia."""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import FinDt
+
+
+def _chave_semana(dia):
+    ano, semana, _ = dia.isocalendar()
+    return "{:02d}/{}".format(semana, ano)
+
+
+AGREGACOES = [('dias_uteis_por_semana', _chave_semana),
+              ('dias_uteis_por_mes', lambda dia: dia.strftime("%m/%Y")),
+              ('dias_uteis_por_trimestre', lambda dia: "{}T/{}".format((dia.month - 1) // 3 + 1, dia.year)),
+              ('dias_uteis_por_ano', lambda dia: str(dia.year))]
+
+
+def _periodos():
+    """
+    Argumentos (data_inicio, data_fim, num_dias) de DatasFinanceiras: periodos aleatorios (semente fixa) com data
+    final, com num_dias positivo ou negativo e com data final anterior a data inicial.
+    """
+    aleatorio = random.Random(1)
+    periodos = [('01/01/2013', '31/12/2013', None), ('15/02/2013', '15/02/2013', None),
+                ('10/06/2016', '02/06/2016', None), ('01/03/2013', None, -40)]
+    for _ in range(40):
+        inicio = date(2012, 6, 1) + timedelta(aleatorio.randrange(900))
+        tamanho = aleatorio.choice([1, 5, 30, 95, 400])
+        forma = aleatorio.choice(['fim', 'reverso', 'num_dias', 'num_dias_negativo'])
+        if forma == 'fim':
+            periodos.append((inicio, inicio + timedelta(tamanho), None))
+        elif forma == 'reverso':
+            periodos.append((inicio, inicio - timedelta(tamanho), None))
+        else:
+            periodos.append((inicio, None, tamanho if forma == 'num_dias' else -tamanho))
+    return periodos
+
+
+@pytest.mark.parametrize('data_inicio, data_fim, num_dias', _periodos())
+def test_agregacoes_iguais_a_contagem_dia_a_dia(path_arquivo, data_inicio, data_fim, num_dias):
+    periodo = FinDt.DatasFinanceiras(data_inicio, data_fim, num_dias, path_arquivo=path_arquivo)
+    uteis = set(periodo.dias(3))
+    for agregacao, chave in AGREGACOES:
+        esperado = {}
+        for dia in periodo.dias(1):
+            esperado[chave(dia)] = esperado.get(chave(dia), 0) + (dia in uteis)
+        itens = list(esperado.items())
+        if agregacao == 'dias_uteis_por_mes':
+            # mantém a ordenação original das chaves 'mm/aaaa'
+            itens.sort(key=lambda t: t[0])
+        assert list(getattr(periodo, agregacao)().items()) == itens
+        assert sum(esperado.values()) == periodo.conta_dias(3)
+
+
+def test_periodo_lazy(path_arquivo):
+    periodo = FinDt.DatasFinanceiras('20/12/2012', '10/01/2014', path_arquivo=path_arquivo)
+    lazy = FinDt.DatasFinanceiras('20/12/2012', '10/01/2014', path_arquivo=path_arquivo, lazy=True)
+    for agregacao, _ in AGREGACOES:
+        assert getattr(lazy, agregacao)() == getattr(periodo, agregacao)()
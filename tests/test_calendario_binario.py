@@ -0,0 +1,62 @@
+# -*- coding: UTF-8 -*-
+
+r"""Ida e volta entre o arquivo de feriados csv e o formato binario de compila_calendario()."""
+
+import os
+
+import pytest
+
+import FinDt
+
+
+@pytest.fixture
+def arquivos(path_arquivo, tmp_path):
+    path_binario = str(tmp_path / 'feriados.fdc')
+    FinDt.compila_calendario(path_arquivo, path_binario)
+    return path_arquivo, path_binario
+
+
+def test_ida_e_volta(arquivos, feriados):
+    path_csv, path_binario = arquivos
+    csv = FinDt.CalendarioFeriados.de_csv(path_csv)
+    binario = FinDt.carrega_calendario(path_binario)
+    assert list(binario.ordinais) == list(csv.ordinais)
+    assert dict(binario.feriados) == dict(csv.feriados) == dict(feriados)
+    assert binario.path_arquivo == os.path.abspath(path_binario)
+
+    periodo_csv = FinDt.DatasFinanceiras('01/01/2013', '31/12/2013', path_arquivo=path_csv)
+    periodo_binario = FinDt.DatasFinanceiras('01/01/2013', '31/12/2013', path_arquivo=path_binario)
+    assert periodo_binario.dias(3) == periodo_csv.dias(3)
+    assert periodo_binario.lista_feriados() == periodo_csv.lista_feriados()
+
+
+def test_recompilacao_recarrega(arquivos, feriados):
+    path_csv, path_binario = arquivos
+    assert len(FinDt.carrega_calendario(path_binario)) == len(feriados)
+    with open(path_csv, 'a', encoding='ISO-8859-1') as arquivo:
+        arquivo.write("15/11/2013;5;Proclamação da República\n")
+    FinDt.compila_calendario(path_csv, path_binario)
+    assert len(FinDt.carrega_calendario(path_binario)) == len(feriados) + 1
+
+
+@pytest.mark.parametrize('corte', [4, 16, 30, -1])
+def test_arquivo_truncado(arquivos, tmp_path, corte):
+    _, path_binario = arquivos
+    with open(path_binario, 'rb') as arquivo:
+        conteudo = arquivo.read()
+    path_truncado = str(tmp_path / 'truncado.fdc')
+    with open(path_truncado, 'wb') as arquivo:
+        arquivo.write(conteudo[:corte])
+    with pytest.raises(ValueError):
+        FinDt.CalendarioFeriados.de_binario(path_truncado)
+
+
+def test_maquina_big_endian(arquivos, monkeypatch):
+    path_csv, path_binario = arquivos
+    # força a conversão dos inteiros usada em máquinas big-endian (o arquivo é sempre little-endian)
+    monkeypatch.setattr(FinDt.sys, 'byteorder', 'big')
+    binario = FinDt.CalendarioFeriados.de_binario(path_binario)
+    csv = FinDt.CalendarioFeriados.de_csv(path_csv)
+    assert list(binario.ordinais) == list(csv.ordinais)
+    assert dict(binario.feriados) == dict(csv.feriados)
+    assert binario.conta_dias_uteis('01/01/2013', '31/12/2013') == csv.conta_dias_uteis('01/01/2013', '31/12/2013')
@@ -0,0 +1,59 @@
+# -*- coding: UTF-8 -*-
+
+r"""Conversao de datas: FormataData, parse_many e os erros de formato (ValueError) e de tipo (TypeError)."""
+
+from datetime import date, datetime
+
+import pytest
+
+import FinDt
+
+
+@pytest.mark.parametrize('texto', ['05/03/2013', '05-03-2013', '05:03:2013', '05 03 2013', '05032013'])
+def test_formatos_aceitos(texto):
+    assert FinDt.FormataData(texto).str_para_data() == date(2013, 3, 5)
+    assert FinDt.FormataData(texto).normaliza_data() == '05/03/2013'
+    assert FinDt.FormataData(texto).data_para_str() == '05/03/2013'
+
+
+def test_data_para_str():
+    assert FinDt.FormataData(date(2013, 3, 5)).data_para_str() == '05/03/2013'
+    assert FinDt.FormataData().data_para_str() is None
+    assert FinDt.FormataData().str_para_data() is None
+
+
+@pytest.mark.parametrize('texto', ['5/3/2013', '2013-03-05', '05/03/13', 'xx/xx/xxxx', '', '32/01/2013', '29/02/2013'])
+def test_formato_invalido(texto):
+    with pytest.raises(ValueError):
+        FinDt.FormataData(texto).str_para_data()
+    with pytest.raises(ValueError):
+        FinDt.parse_many(['01/01/2013', texto])
+
+
+@pytest.mark.parametrize('valor', [12, 20130305.0, datetime(2013, 3, 5, 10, 30), ['05/03/2013']])
+def test_tipo_invalido(valor):
+    with pytest.raises(TypeError):
+        FinDt.FormataData(valor).str_para_data()
+    with pytest.raises(TypeError):
+        FinDt.FormataData(valor).data_para_str()
+    with pytest.raises(TypeError):
+        FinDt.parse_many([valor])
+
+
+def test_normaliza_data_tipo_invalido():
+    with pytest.raises(TypeError):
+        FinDt.FormataData(date(2013, 3, 5)).normaliza_data()
+
+
+def test_parse_many():
+    datas = ['05/03/2013', date(2013, 3, 6), '07-03-2013', '05/03/2013']
+    assert FinDt.parse_many(datas) == [date(2013, 3, 5), date(2013, 3, 6), date(2013, 3, 7), date(2013, 3, 5)]
+    assert FinDt.parse_many(iter(['01/01/2000'])) == [date(2000, 1, 1)]
+    assert FinDt.parse_many([]) == []
+
+
+def test_datas_financeiras_com_data_invalida():
+    with pytest.raises(ValueError):
+        FinDt.DatasFinanceiras('31/02/2013', '01/03/2013')
+    with pytest.raises(TypeError):
+        FinDt.DatasFinanceiras(20130101, '01/03/2013')
@@ -0,0 +1,126 @@
+# -*- coding: UTF-8 -*-
+
+r"""Equivalencia do indice de dias uteis (mascara de bits e acumulados) e dos deslocamentos com um filtro ingenuo.
+
+Os feriados cobrem 2012 a 2014, de modo que o indice do calendario vai de 01/01/2012 a 31/12/2014; os periodos
+testados comecam antes e terminam depois deste intervalo, cruzando as suas bordas.
+"""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import FinDt
+
+FERIADOS = [date(2012, 1, 1), date(2012, 2, 20), date(2012, 2, 21), date(2012, 4, 6), date(2012, 4, 21),
+            date(2012, 5, 1), date(2012, 6, 7), date(2012, 9, 7), date(2012, 10, 12), date(2012, 11, 2),
+            date(2012, 11, 15), date(2012, 12, 25),
+            date(2013, 1, 1), date(2013, 2, 11), date(2013, 2, 12), date(2013, 3, 29), date(2013, 4, 21),
+            date(2013, 5, 1), date(2013, 5, 30), date(2013, 9, 7), date(2013, 10, 12), date(2013, 11, 2),
+            date(2013, 11, 15), date(2013, 12, 25),
+            date(2014, 1, 1), date(2014, 3, 3), date(2014, 3, 4), date(2014, 4, 18), date(2014, 4, 21),
+            date(2014, 5, 1), date(2014, 6, 19), date(2014, 9, 7), date(2014, 10, 12), date(2014, 11, 2),
+            date(2014, 11, 15), date(2014, 12, 25), date(2014, 12, 31)]
+
+INICIO = date(2011, 10, 1)
+FIM = date(2015, 3, 31)
+
+
+def _eh_util(dia):
+    return dia.isoweekday() < 6 and dia not in FERIADOS
+
+
+def _dias(inicio, fim):
+    return [inicio + timedelta(i) for i in range((fim - inicio).days + 1)]
+
+
+def _str(dia):
+    return dia.strftime("%d/%m/%Y")
+
+
+def _periodos():
+    """
+    Periodos (inicio, fim) aleatorios (semente fixa) e periodos que cruzam as bordas do indice.
+    """
+    aleatorio = random.Random(0)
+    total = (FIM - INICIO).days
+    periodos = []
+    for _ in range(150):
+        inicio = INICIO + timedelta(aleatorio.randrange(total))
+        periodos.append((inicio, min(inicio + timedelta(aleatorio.choice([0, 1, 6, 30, 63, 64, 65, 200, 900])),
+                                     FIM)))
+    for borda in (date(2012, 1, 1), date(2014, 12, 31)):
+        for antes in (0, 1, 3, 40):
+            for depois in (0, 1, 5, 70):
+                periodos.append((borda - timedelta(antes), borda + timedelta(depois)))
+    periodos.append((INICIO, FIM))
+    periodos.append((date(2010, 1, 1), date(2010, 12, 31)))
+    return periodos
+
+
+@pytest.fixture
+def feriados():
+    return [(feriado, "feriado " + feriado.isoformat()) for feriado in FERIADOS]
+
+
+@pytest.mark.parametrize('inicio, fim', _periodos())
+def test_dias_e_contagens(path_arquivo, inicio, fim):
+    periodo = FinDt.DatasFinanceiras(_str(inicio), _str(fim), path_arquivo=path_arquivo)
+    todos = _dias(inicio, fim)
+    esperado = {1: todos,
+                2: [dia for dia in todos if dia.isoweekday() < 6],
+                3: [dia for dia in todos if _eh_util(dia)]}
+    for opt in (1, 2, 3):
+        assert periodo.dias(opt) == esperado[opt]
+        assert periodo.dias(opt, 'str') == [_str(dia) for dia in esperado[opt]]
+        assert list(periodo.itera_dias(opt)) == esperado[opt]
+        assert periodo.conta_dias(opt) == len(esperado[opt])
+    assert periodo.lista_feriados() == {feriado: "feriado " + feriado.isoformat()
+                                        for feriado in FERIADOS if inicio <= feriado <= fim}
+    assert periodo.calendario.conta_dias_uteis(inicio, fim) == len(esperado[3])
+
+
+def test_contagem_com_data_final_anterior(path_arquivo):
+    calendario = FinDt.carrega_calendario(path_arquivo)
+    for inicio, fim in [(date(2013, 1, 10), date(2013, 1, 1)), (date(2012, 1, 3), date(2011, 12, 20)),
+                        (date(2015, 1, 2), date(2014, 12, 30))]:
+        periodo = FinDt.DatasFinanceiras(_str(inicio), _str(fim), path_arquivo=path_arquivo)
+        assert calendario.conta_dias_uteis(inicio, fim) == periodo.conta_dias(3) == len(periodo.dias(3))
+
+
+def test_deslocamentos(path_arquivo):
+    calendario = FinDt.carrega_calendario(path_arquivo)
+    uteis = [dia for dia in _dias(INICIO - timedelta(60), FIM + timedelta(60)) if _eh_util(dia)]
+    for dia in _dias(INICIO, FIM):
+        posteriores = [util for util in uteis if util > dia]
+        anteriores = [util for util in uteis if util < dia][::-1]
+        for num_dias in range(1, 12):
+            assert calendario.add_dias_uteis(dia, num_dias) == posteriores[num_dias - 1]
+            assert calendario.add_dias_uteis(dia, -num_dias) == anteriores[num_dias - 1]
+        seguinte = dia if _eh_util(dia) else posteriores[0]
+        anterior = dia if _eh_util(dia) else anteriores[0]
+        assert calendario.add_dias_uteis(dia, 0) == seguinte
+        assert calendario.ajusta_dia_util(dia, 'following') == seguinte
+        assert calendario.ajusta_dia_util(dia, 'preceding') == anterior
+        assert calendario.ajusta_dia_util(dia, 'modified_following') == \
+            (seguinte if seguinte.month == dia.month else anterior)
+
+
+def test_indice_de_um_calendario_sem_feriados():
+    calendario = FinDt.CalendarioFeriados([], [])
+    periodo = FinDt.DatasFinanceiras('30/12/2013', '05/01/2014', calendario=calendario)
+    assert periodo.dias(3) == periodo.dias(2)
+    assert calendario.conta_dias_uteis('30/12/2013', '05/01/2014') == 5
+    assert calendario.add_dias_uteis('03/01/2014', 1) == date(2014, 1, 6)
+
+
+def test_lote_igual_ao_escalar(path_arquivo):
+    np = pytest.importorskip('numpy')
+    calendario = FinDt.carrega_calendario(path_arquivo)
+    inicios, fins = zip(*(_periodos() + [(date(2013, 1, 10), date(2013, 1, 1))]))
+    contagens = calendario.conta_dias_uteis_lote(inicios, fins)
+    assert list(contagens) == [calendario.conta_dias_uteis(*periodo) for periodo in zip(inicios, fins)]
+    for num_dias in (-7, -1, 0, 1, 7):
+        deslocadas = calendario.desloca_dias_uteis_lote(inicios, num_dias)
+        assert list(deslocadas) == [np.datetime64(calendario.add_dias_uteis(dia, num_dias)) for dia in inicios]
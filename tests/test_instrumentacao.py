@@ -0,0 +1,111 @@
+# -*- coding: UTF-8 -*-
+
+r"""Instrumentacao: instalacao e remocao dos envoltorios, blocos simultaneos e contagem das chamadas."""
+
+import threading
+
+import pytest
+
+import FinDt
+
+DF = FinDt.DatasFinanceiras
+
+
+@pytest.fixture(autouse=True)
+def instrumentacao_desligada():
+    yield
+    FinDt.desativa_instrumentacao()
+    FinDt.zera_instrumentacao()
+
+
+@pytest.fixture
+def periodo(path_arquivo):
+    return DF('01/01/2013', '31/12/2013', path_arquivo=path_arquivo)
+
+
+def test_envoltorios_instalados_e_removidos():
+    dias = vars(DF)['dias']
+    dia_semana = vars(DF)['dia_semana']
+    analisa_data = FinDt._analisa_data
+    assert not hasattr(DF.dias, '__wrapped__')
+
+    FinDt.ativa_instrumentacao()
+    assert DF.dias.__wrapped__ is dias
+    assert FinDt._analisa_data.__wrapped__ is analisa_data
+    assert isinstance(vars(DF)['dia_semana'], staticmethod)
+    assert DF.dia_semana.__wrapped__ is dia_semana.__func__
+
+    FinDt.desativa_instrumentacao()
+    assert vars(DF)['dias'] is dias
+    assert vars(DF)['dia_semana'] is dia_semana
+    assert FinDt._analisa_data is analisa_data
+    assert not hasattr(DF.dias, '__wrapped__')
+
+
+def test_metodo_estatico_instrumentado(periodo):
+    with FinDt.instrumentacao() as medicao:
+        assert DF.dia_semana('03/04/2013') == 'quarta-feira'
+        assert periodo.dia_semana('04/04/2013') == 'quinta-feira'
+    assert medicao['DatasFinanceiras.dia_semana']['chamadas'] == 2
+
+
+def test_chamada_unica_de_dias_str(periodo):
+    with FinDt.instrumentacao() as medicao:
+        periodo.dias(3, 'str')
+    assert medicao['DatasFinanceiras.dias']['chamadas'] == 1
+
+
+def test_conversao_de_datas_fora_do_cache():
+    FinDt._str_para_data.cache_clear()
+    with FinDt.instrumentacao() as medicao:
+        FinDt.parse_many(['01/01/2013', '02/01/2013', '01/01/2013'])
+    assert medicao['conversao_data']['chamadas'] == 2
+
+
+def test_blocos_aninhados(periodo):
+    with FinDt.instrumentacao() as externo:
+        with FinDt.instrumentacao() as interno:
+            periodo.conta_dias(3)
+        assert hasattr(DF.conta_dias, '__wrapped__')
+        periodo.conta_dias(3)
+    assert not hasattr(DF.conta_dias, '__wrapped__')
+    assert interno['DatasFinanceiras.conta_dias']['chamadas'] == 1
+    assert externo['DatasFinanceiras.conta_dias']['chamadas'] == 2
+
+
+def test_blocos_simultaneos(periodo):
+    # o bloco da thread 'a' termina enquanto o da thread 'b' ainda está em execução
+    dentro_b, fim_a = threading.Event(), threading.Event()
+    medicoes = {}
+
+    def a():
+        dentro_b.wait()
+        with FinDt.instrumentacao():
+            pass
+        fim_a.set()
+
+    def b():
+        with FinDt.instrumentacao() as medicao:
+            dentro_b.set()
+            fim_a.wait()
+            periodo.conta_dias(3)
+        medicoes['b'] = medicao
+
+    threads = [threading.Thread(target=b), threading.Thread(target=a)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert medicoes['b']['DatasFinanceiras.conta_dias']['chamadas'] == 1
+    assert not hasattr(DF.conta_dias, '__wrapped__')
+
+
+def test_ativa_instrumentacao_com_bloco(periodo):
+    FinDt.ativa_instrumentacao()
+    with FinDt.instrumentacao():
+        pass
+    periodo.dias(1)
+    assert FinDt.instantaneo_instrumentacao()['DatasFinanceiras.dias']['chamadas'] == 1
+    FinDt.desativa_instrumentacao()
+    periodo.dias(1)
+    assert FinDt.instantaneo_instrumentacao()['DatasFinanceiras.dias']['chamadas'] == 1
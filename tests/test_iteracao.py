@@ -0,0 +1,85 @@
+# -*- coding: UTF-8 -*-
+
+r"""Geradores de dias sem data final (itera_dias, itera_dia_especifico_semana) e os geradores de DatasFinanceiras."""
+
+from datetime import date, timedelta
+from itertools import islice
+
+import pytest
+
+import FinDt
+
+
+def _eh_util(dia, feriados):
+    return dia.isoweekday() < 6 and dia not in dict(feriados)
+
+
+@pytest.mark.parametrize('sentido', [1, -1])
+@pytest.mark.parametrize('opt', [1, 2, 3])
+def test_itera_dias(path_arquivo, feriados, opt, sentido):
+    inicio = date(2013, 1, 20)
+    filtro = {1: lambda dia: True, 2: lambda dia: dia.isoweekday() < 6, 3: lambda dia: _eh_util(dia, feriados)}[opt]
+    esperado = [dia for dia in (inicio + timedelta(sentido * i) for i in range(800)) if filtro(dia)][:300]
+    assert list(islice(FinDt.itera_dias(inicio, opt, sentido=sentido, path_arquivo=path_arquivo), 300)) == esperado
+    assert list(islice(FinDt.itera_dias('20/01/2013', opt, 'str', sentido, path_arquivo=path_arquivo), 3)) == \
+        [dia.strftime("%d/%m/%Y") for dia in esperado[:3]]
+
+
+def test_itera_dias_interrompido(path_arquivo):
+    gerador = FinDt.itera_dias('01/01/2013', 3, path_arquivo=path_arquivo)
+    assert next(gerador) == date(2013, 1, 2)
+    assert next(gerador) == date(2013, 1, 3)
+    gerador.close()
+    with pytest.raises(StopIteration):
+        next(gerador)
+
+
+@pytest.mark.parametrize('opt', [1, 2, 3])
+def test_itera_dias_nos_limites_de_date(path_arquivo, opt):
+    # a iteração termina em date.max (para frente) e em date.min (para trás)
+    filtro = (lambda dia: True) if opt == 1 else (lambda dia: dia.isoweekday() < 6)
+    assert list(FinDt.itera_dias(date.max - timedelta(9), opt, path_arquivo=path_arquivo)) == \
+        [dia for dia in (date.max - timedelta(9 - i) for i in range(10)) if filtro(dia)]
+    assert list(FinDt.itera_dias(date.min + timedelta(9), opt, sentido=-1, path_arquivo=path_arquivo)) == \
+        [dia for dia in (date.min + timedelta(9 - i) for i in range(10)) if filtro(dia)]
+
+
+@pytest.mark.parametrize('opt', [0, 4, '3', None])
+def test_opcao_invalida(path_arquivo, opt):
+    periodo = FinDt.DatasFinanceiras('01/01/2013', '31/01/2013', path_arquivo=path_arquivo)
+    with pytest.raises(ValueError):
+        list(periodo.itera_dias(opt))
+    with pytest.raises(ValueError):
+        next(FinDt.itera_dias('01/01/2013', opt, path_arquivo=path_arquivo))
+
+
+@pytest.mark.parametrize('sentido', [1, -1])
+@pytest.mark.parametrize('dia_da_semana', range(1, 8))
+def test_itera_dia_especifico_semana(dia_da_semana, sentido):
+    inicio = date(2013, 5, 15)
+    esperado = [dia for dia in (inicio + timedelta(sentido * i) for i in range(60))
+                if dia.isoweekday() == dia_da_semana][:5]
+    assert list(islice(FinDt.itera_dia_especifico_semana(inicio, dia_da_semana, sentido=sentido), 5)) == esperado
+
+
+def test_itera_dia_especifico_semana_nos_limites_de_date():
+    assert list(FinDt.itera_dia_especifico_semana(date.max - timedelta(10), 5)) == [date.max - timedelta(7), date.max]
+    assert list(FinDt.itera_dia_especifico_semana(date.min + timedelta(10), 1, sentido=-1)) == \
+        [date.min + timedelta(7), date.min]
+
+
+@pytest.mark.parametrize('dia_da_semana', [0, 8, -1])
+def test_itera_dia_especifico_semana_invalido(dia_da_semana):
+    assert list(islice(FinDt.itera_dia_especifico_semana('01/01/2013', dia_da_semana), 3)) == []
+    periodo = FinDt.DatasFinanceiras('01/01/2013', '31/01/2013')
+    assert list(periodo.itera_dia_especifico_semana(dia_da_semana)) == []
+
+
+def test_geradores_do_periodo(path_arquivo):
+    periodo = FinDt.DatasFinanceiras('20/12/2012', '20/02/2013', path_arquivo=path_arquivo)
+    for opt in (1, 2, 3):
+        assert list(periodo.itera_dias(opt, 'str')) == periodo.dias(opt, 'str')
+    for dia_da_semana in range(1, 8):
+        assert list(periodo.itera_dia_especifico_semana(dia_da_semana)) == \
+            periodo.lista_dia_especifico_semana(dia_da_semana)
+    assert dict(periodo.itera_feriados()) == periodo.lista_feriados()
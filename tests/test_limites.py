@@ -0,0 +1,97 @@
+# -*- coding: UTF-8 -*-
+
+r"""Primeiro/ultimo dia (util) de mes, trimestre e ano: metodos de DatasFinanceiras e limites_periodo_lote, nas
+versoes com listas e com numpy.ndarray (datetime64), inclusive para datas anteriores a 1970."""
+
+import random
+from datetime import date, timedelta
+
+import pytest
+
+import FinDt
+
+DF = FinDt.DatasFinanceiras
+
+
+def _datas():
+    aleatorio = random.Random(2)
+    datas = [date(1969, 12, 31), date(1970, 1, 1), date(1900, 3, 1), date(2012, 2, 29), date(2013, 12, 31),
+             date(2013, 1, 1), date(2013, 3, 31), date(2013, 4, 1)]
+    return datas + [date(1950, 1, 1) + timedelta(aleatorio.randrange(30000)) for _ in range(300)]
+
+
+def _limites(data, periodo):
+    """
+    Primeiro e último dia do periodo ('mes', 'trimestre' ou 'ano') que contém a data, dia a dia.
+    """
+    if periodo == 'mes':
+        mesmo = lambda dia: (dia.year, dia.month) == (data.year, data.month)
+    elif periodo == 'trimestre':
+        mesmo = lambda dia: (dia.year, (dia.month - 1) // 3) == (data.year, (data.month - 1) // 3)
+    else:
+        mesmo = lambda dia: dia.year == data.year
+    inicio = fim = data
+    while mesmo(inicio - timedelta(1)):
+        inicio -= timedelta(1)
+    while mesmo(fim + timedelta(1)):
+        fim += timedelta(1)
+    return inicio, fim
+
+
+def test_metodos_estaticos():
+    for data in _datas():
+        for periodo, primeiro, ultimo in [('mes', DF.primeiro_dia_mes, DF.ultimo_dia_mes),
+                                          ('trimestre', DF.primeiro_dia_trimestre, DF.ultimo_dia_trimestre),
+                                          ('ano', DF.primeiro_dia_ano, DF.ultimo_dia_ano)]:
+            inicio, fim = _limites(data, periodo)
+            assert primeiro(data) == inicio
+            assert ultimo(data) == fim
+            assert primeiro(data.strftime("%d/%m/%Y"), 'str') == inicio.strftime("%d/%m/%Y")
+            assert ultimo(data, 'str') == fim.strftime("%d/%m/%Y")
+
+
+def test_dias_uteis_do_mes(path_arquivo, feriados):
+    periodo = DF('01/01/2013', '31/12/2013', path_arquivo=path_arquivo)
+    for mes in range(1, 13):
+        dias = [dia for dia in periodo.dias(1) if dia.month == mes and dia.isoweekday() < 6
+                and dia not in dict(feriados)]
+        assert periodo.primeiro_dia_util_mes(date(2013, mes, 15)) == dias[0]
+        assert periodo.ultimo_dia_util_mes('15/{:02d}/2013'.format(mes), 'str') == dias[-1].strftime("%d/%m/%Y")
+
+
+@pytest.mark.parametrize('extremo', ['inicio', 'fim'])
+@pytest.mark.parametrize('periodo', ['mes', 'trimestre', 'ano'])
+def test_lote_com_lista(periodo, extremo):
+    datas = _datas()
+    esperado = [_limites(data, periodo)[0 if extremo == 'inicio' else 1] for data in datas]
+    assert FinDt.limites_periodo_lote(datas, periodo, extremo) == esperado
+    assert FinDt.limites_periodo_lote([data.strftime("%d/%m/%Y") for data in datas], periodo, extremo) == esperado
+
+
+@pytest.mark.parametrize('extremo', ['inicio', 'fim'])
+@pytest.mark.parametrize('periodo', ['mes', 'trimestre', 'ano'])
+def test_lote_com_datetime64(path_arquivo, periodo, extremo):
+    np = pytest.importorskip('numpy')
+    datas = _datas()
+    vetor = np.array(datas, dtype='datetime64[D]')
+    for argumentos in ({}, {'path_arquivo': path_arquivo}):
+        lista = FinDt.limites_periodo_lote(datas, periodo, extremo, **argumentos)
+        resultado = FinDt.limites_periodo_lote(vetor, periodo, extremo, **argumentos)
+        assert resultado.dtype == np.dtype('datetime64[D]')
+        assert resultado.tolist() == lista
+
+
+def test_lote_ajustado_a_dias_uteis(path_arquivo):
+    calendario = FinDt.carrega_calendario(path_arquivo)
+    datas = [date(2013, mes, 10) for mes in range(1, 13)]
+    assert FinDt.limites_periodo_lote(datas, 'mes', 'inicio', calendario=calendario) == \
+        [calendario.primeiro_dia_util_mes(data) for data in datas]
+    assert FinDt.limites_periodo_lote(datas, 'mes', 'fim', path_arquivo=path_arquivo) == \
+        [calendario.ultimo_dia_util_mes(data) for data in datas]
+
+
+def test_lote_parametros_invalidos():
+    with pytest.raises(ValueError):
+        FinDt.limites_periodo_lote(['01/01/2013'], 'semana')
+    with pytest.raises(ValueError):
+        FinDt.limites_periodo_lote(['01/01/2013'], 'mes', 'meio')
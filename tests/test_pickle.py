@@ -0,0 +1,51 @@
+# -*- coding: UTF-8 -*-
+
+r"""Serializacao (pickle) e imutabilidade de CalendarioFeriados e o executor de consultas em lote."""
+
+import pickle
+
+import pytest
+
+import FinDt
+
+CONSULTAS = [('01/01/2013', '31/12/2013'), ('01/02/2013', '28/02/2013'), ('10/01/2013', '01/01/2013')]
+
+
+def test_calendario_de_arquivo(path_arquivo):
+    calendario = FinDt.carrega_calendario(path_arquivo)
+    assert pickle.loads(pickle.dumps(calendario)) is calendario
+
+
+def test_calendario_binario(path_arquivo, tmp_path):
+    path_binario = str(tmp_path / 'feriados.fdc')
+    FinDt.compila_calendario(path_arquivo, path_binario)
+    calendario = FinDt.carrega_calendario(path_binario)
+    assert pickle.loads(pickle.dumps(calendario)) is calendario
+
+
+def test_calendario_em_memoria(feriados):
+    calendario = FinDt.CalendarioFeriados([feriado.toordinal() for feriado, _ in feriados],
+                                          [descricao for _, descricao in feriados])
+    copia = pickle.loads(pickle.dumps(calendario))
+    assert copia is not calendario
+    assert dict(copia.feriados) == dict(calendario.feriados) == dict(feriados)
+    assert [copia.conta_dias_uteis(*consulta) for consulta in CONSULTAS] == \
+        [calendario.conta_dias_uteis(*consulta) for consulta in CONSULTAS]
+
+
+def test_imutavel(path_arquivo):
+    calendario = FinDt.carrega_calendario(path_arquivo)
+    with pytest.raises(AttributeError):
+        calendario._ordinais = ()
+    with pytest.raises(AttributeError):
+        del calendario._descricoes
+
+
+@pytest.mark.parametrize('processos', [False, True])
+def test_executor(path_arquivo, processos):
+    calendario = FinDt.carrega_calendario(path_arquivo)
+    esperado = [calendario.conta_dias_uteis(*consulta) for consulta in CONSULTAS]
+    with FinDt.ExecutorCalendario(path_arquivo, max_workers=2, processos=processos, tamanho_bloco=2) as executor:
+        assert executor.executa('conta_dias_uteis', CONSULTAS) == esperado
+        with pytest.raises(ValueError):
+            executor.executa('dias', [()])
@@ -0,0 +1,84 @@
+# -*- coding: UTF-8 -*-
+
+r"""Calendarios combinados (uniao/intersecao) e o registro de calendarios nomeados."""
+
+import os
+from datetime import date, timedelta
+
+import pytest
+
+import FinDt
+
+ANBIMA = [(date(2013, 1, 1), 'Confraternização Universal'), (date(2013, 1, 25), 'Aniversário de São Paulo'),
+          (date(2013, 2, 11), 'Carnaval'), (date(2013, 2, 12), 'Carnaval'), (date(2013, 7, 4), 'Dia comum'),
+          (date(2013, 12, 25), 'Natal')]
+EUA = [(date(2013, 1, 1), "New Year's Day"), (date(2013, 1, 21), 'Martin Luther King Jr. Day'),
+       (date(2013, 2, 18), "Washington's Birthday"), (date(2013, 7, 4), 'Independence Day'),
+       (date(2013, 12, 25), 'Christmas Day')]
+
+
+def _uteis(feriados, inicio, fim):
+    return [inicio + timedelta(i) for i in range((fim - inicio).days + 1)
+            if (inicio + timedelta(i)).isoweekday() < 6 and inicio + timedelta(i) not in feriados]
+
+
+@pytest.fixture
+def registro(cria_arquivo_feriados):
+    registro = FinDt.RegistroCalendarios()
+    registro.registra('ANBIMA', cria_arquivo_feriados(ANBIMA, 'anbima.csv'))
+    registro.registra('EUA', cria_arquivo_feriados(EUA, 'eua.csv'))
+    return registro
+
+
+@pytest.mark.parametrize('modo', ['uniao', 'intersecao'])
+def test_combinacao_igual_a_filtro_de_conjuntos(registro, modo):
+    anbima, eua = set(dict(ANBIMA)), set(dict(EUA))
+    feriados = anbima | eua if modo == 'uniao' else anbima & eua
+    combinado = getattr(registro, modo)('ANBIMA', 'EUA')
+    assert set(combinado.feriados) == feriados
+    direto = FinDt.combina_calendarios([registro['ANBIMA'], registro['EUA']], modo)
+    assert list(combinado.ordinais) == list(direto.ordinais)
+
+    inicio, fim = date(2012, 12, 15), date(2014, 1, 15)
+    periodo = FinDt.DatasFinanceiras(inicio, fim, calendario=combinado)
+    assert periodo.dias(3) == _uteis(feriados, inicio, fim)
+    assert combinado.conta_dias_uteis(inicio, fim) == len(_uteis(feriados, inicio, fim))
+    assert combinado.feriados[date(2013, 7, 4)] == 'Dia comum / Independence Day'
+
+
+def test_modo_invalido(registro):
+    with pytest.raises(ValueError):
+        FinDt.combina_calendarios([registro['ANBIMA']], 'diferenca')
+
+
+def test_combinacao_mantida_em_cache(registro):
+    assert registro.uniao('ANBIMA', 'EUA') is registro.uniao('ANBIMA', 'EUA')
+    assert registro.uniao('ANBIMA', 'EUA') is not registro.uniao('EUA', 'ANBIMA')
+
+
+def test_combinacao_recalculada_apos_recarga(registro, cria_arquivo_feriados):
+    uniao = registro.uniao('ANBIMA', 'EUA')
+    assert date(2013, 11, 20) not in uniao
+    path_anbima = cria_arquivo_feriados(ANBIMA + [(date(2013, 11, 20), 'Consciência Negra')], 'anbima.csv')
+    # garante que a data de modificação do arquivo mude, mesmo em sistemas de arquivos com baixa resolução
+    info = os.stat(path_anbima)
+    os.utime(path_anbima, ns=(info.st_atime_ns, info.st_mtime_ns + 10 ** 9))
+    nova_uniao = registro.uniao('ANBIMA', 'EUA')
+    assert nova_uniao is not uniao
+    assert date(2013, 11, 20) in nova_uniao
+    assert len(nova_uniao) == len(uniao) + 1
+
+
+def test_registro(registro, feriados):
+    assert registro.nomes() == ['ANBIMA', 'EUA']
+    assert 'EUA' in registro and 'B3' not in registro
+    with pytest.raises(KeyError):
+        registro['B3']
+    calendario = FinDt.CalendarioFeriados([feriado.toordinal() for feriado, _ in feriados],
+                                          [descricao for _, descricao in feriados])
+    registro.registra('MEMORIA', calendario=calendario)
+    assert registro['MEMORIA'] is calendario
+    with pytest.raises(ValueError):
+        registro.registra('NENHUM')
+    with pytest.raises(ValueError):
+        registro.registra('AMBOS', 'feriados.csv', calendario)
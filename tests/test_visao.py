@@ -0,0 +1,52 @@
+# -*- coding: UTF-8 -*-
+
+r"""Visoes (subperiodos lazy) de DatasFinanceiras: limites e metodos sobre a visao."""
+
+from datetime import date
+
+import pytest
+
+import FinDt
+
+
+@pytest.fixture
+def periodo(path_arquivo):
+    return FinDt.DatasFinanceiras('01/01/2013', '31/03/2013', path_arquivo=path_arquivo)
+
+
+def test_metodos_da_visao(periodo, path_arquivo):
+    visao = periodo.visao('05/02/2013', date(2013, 3, 10))
+    referencia = FinDt.DatasFinanceiras('05/02/2013', '10/03/2013', path_arquivo=path_arquivo)
+    for opt in (1, 2, 3):
+        assert visao.dias(opt) == referencia.dias(opt)
+        assert visao.dias(opt, 'str') == referencia.dias(opt, 'str')
+        assert visao.conta_dias(opt) == referencia.conta_dias(opt)
+    assert visao.lista_feriados() == referencia.lista_feriados() == {date(2013, 2, 11): 'Carnaval',
+                                                                     date(2013, 2, 12): 'Carnaval'}
+    assert visao.lista_feriados('str') == referencia.lista_feriados('str')
+    assert visao.dias_uteis_por_mes() == referencia.dias_uteis_por_mes()
+    assert len(visao) == 34 and date(2013, 2, 5) in visao and date(2013, 2, 4) not in visao
+
+
+def test_limite_omitido(periodo):
+    assert periodo.visao().dias() == periodo.dias()
+    assert periodo.visao('15/03/2013').dias() == [date(2013, 3, dia) for dia in range(15, 32)]
+    assert periodo.visao(data_fim='03/01/2013').dias() == [date(2013, 1, dia) for dia in range(1, 4)]
+    assert periodo.subperiodo(data_fim='03/01/2013', dt_type='str') == ['01/01/2013', '02/01/2013', '03/01/2013']
+
+
+def test_visao_de_visao(periodo):
+    visao = periodo.visao('01/02/2013', '28/02/2013').visao('10/02/2013', '12/02/2013')
+    assert visao.dias() == [date(2013, 2, 10), date(2013, 2, 11), date(2013, 2, 12)]
+    assert visao.dias(3) == []
+
+
+@pytest.mark.parametrize('data_inicio, data_fim', [('31/12/2012', None), ('01/04/2013', None),
+                                                   (None, '01/04/2013'), (None, '31/12/2012'),
+                                                   ('31/12/2012', '01/04/2013'), ('10/02/2013', '09/02/2013'),
+                                                   ('31/03/2013', '01/01/2013')])
+def test_limites_invalidos(periodo, data_inicio, data_fim):
+    with pytest.raises(ValueError):
+        periodo.visao(data_inicio, data_fim)
+    with pytest.raises(ValueError):
+        periodo.subperiodo(data_inicio, data_fim)